@@ -1,14 +1,36 @@
-import tkinter as tk
-import ttkbootstrap as ttk
-from ttkbootstrap.constants import *
+import time
+import argparse
 
-from gui.main_window import VehicleDetectorApp
+_STARTED = time.perf_counter()
 
 
 def main():
     """Main entry point of the application"""
+    parser = argparse.ArgumentParser(description="Vehicle counting GUI")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print import and first-frame timings")
+    args, _ = parser.parse_known_args()
+
+    from utils import startup_profile
+    if args.startup_profile:
+        startup_profile.enable(_STARTED)
+    startup_profile.mark("interpreter ready")
+
+    import ttkbootstrap as ttk
+    startup_profile.mark("ttkbootstrap imported")
+    # Heavy modules (ultralytics/torch, pandas, matplotlib, openpyxl) load on first use
+    from gui.main_window import VehicleDetectorApp
+    startup_profile.mark("GUI modules imported")
+
     root = ttk.Window(themename="darkly")
     app = VehicleDetectorApp(root)
+    startup_profile.mark("main window built")
+
+    def window_ready():
+        startup_profile.mark("window interactive")
+        startup_profile.report_modules()
+
+    root.after_idle(window_ready)
     root.mainloop()
 
 
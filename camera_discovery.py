@@ -0,0 +1,176 @@
+# core/camera_discovery.py
+import os
+import re
+import sys
+import glob
+import json
+import threading
+import time
+
+import cv2
+
+CAMERA_CACHE_PATH = os.path.join("data", "cameras.json")
+MAX_CAMERA_INDEX = 10     # indices probed when /dev/video* cannot be listed
+PROBE_TIMEOUT = 3.0       # seconds before a probe is abandoned
+FRAME_TIMEOUT = 2.0       # a first frame slower than this counts as a dead device
+
+
+def platform_backends():
+    """Capture backends to try, most specific first"""
+    if sys.platform.startswith('win'):
+        return [cv2.CAP_DSHOW, cv2.CAP_MSMF]
+    if sys.platform.startswith('linux'):
+        return [cv2.CAP_V4L2, cv2.CAP_ANY]
+    return [cv2.CAP_AVFOUNDATION, cv2.CAP_ANY]
+
+
+def backend_name(backend):
+    """Human-readable backend name"""
+    names = {
+        cv2.CAP_DSHOW: "DirectShow",
+        cv2.CAP_MSMF: "Media Foundation",
+        cv2.CAP_V4L2: "Video4Linux2",
+        cv2.CAP_AVFOUNDATION: "AVFoundation",
+        cv2.CAP_ANY: "Default"
+    }
+    return names.get(backend, "Unknown")
+
+
+def _sysfs_attribute(index, name):
+    try:
+        with open(f"/sys/class/video4linux/video{index}/{name}") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def list_video_devices(dev_glob="/dev/video*"):
+    """(index, label) of V4L2 capture nodes, or None when the platform has no /dev/video*"""
+    if not sys.platform.startswith('linux'):
+        return None
+    devices = []
+    for path in glob.glob(dev_glob):
+        match = re.fullmatch(r".*video(\d+)", path)
+        if not match:
+            continue
+        index = int(match.group(1))
+        # UVC cameras also expose a metadata node; only stream index 0 carries frames
+        if _sysfs_attribute(index, "index") not in (None, "0"):
+            continue
+        devices.append((index, _sysfs_attribute(index, "name")))
+    return sorted(devices)
+
+
+def probe_camera(index, backends, open_capture=None, label=None, pool=None):
+    """Camera info dict if `index` delivers a frame with one of `backends`, else None.
+
+    With a CapturePool the working handle is parked there instead of
+    released, so testing or selecting the camera does not reopen it.
+    """
+    if open_capture is None:
+        open_capture = pool.acquire if pool is not None else cv2.VideoCapture
+    if pool is not None and pool.parked_backend(index) in backends:
+        # A parked handle is reused whatever backend is asked for, report the one it has
+        parked = pool.parked_backend(index)
+        backends = [parked] + [b for b in backends if b != parked]
+    for backend in backends:
+        cap = None
+        try:
+            cap = open_capture(index, backend)
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            if not cap.isOpened():
+                continue
+            start_time = time.time()
+            ret, frame = cap.read()
+            if not ret or frame is None or frame.size == 0 or time.time() - start_time >= FRAME_TIMEOUT:
+                continue
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            camera_info = {
+                'index': index,
+                'name': f"{label or f'Camera {index}'} ({backend_name(backend)})",
+                'resolution': f"{width}x{height}",
+                'fps': f"{fps:.0f}" if fps > 0 else "30",
+                'backend': backend
+            }
+            if pool is not None:
+                pool.park(index, cap, backend)
+                cap = None
+            return camera_info
+        except Exception as e:
+            print(f"[WARNING] Error testing camera {index} with backend {backend}: {e}")
+        finally:
+            if cap is not None:
+                cap.release()
+    return None
+
+
+def discover_cameras(candidates=None, backends=None, open_capture=None, timeout=PROBE_TIMEOUT, preferred=None,
+                     pool=None):
+    """Probe all candidate devices at once and return the cameras that answered in time.
+
+    `candidates` is a list of (index, label); by default the /dev/video*
+    nodes, or indices 0..MAX_CAMERA_INDEX-1 elsewhere. `preferred` maps an
+    index to the backend that worked last time, which is tried first.
+    A probe still running at the deadline is abandoned (its daemon thread
+    releases the device whenever the driver returns). Working handles
+    go to `pool` when one is given.
+    """
+    if candidates is None:
+        candidates = list_video_devices()
+        if candidates is None:
+            candidates = [(i, None) for i in range(MAX_CAMERA_INDEX)]
+    backends = backends or platform_backends()
+    preferred = preferred or {}
+
+    results = {}
+    threads = []
+    for index, label in candidates:
+        order = backends
+        if preferred.get(index) in backends:
+            order = [preferred[index]] + [b for b in backends if b != preferred[index]]
+
+        def probe(index=index, label=label, order=order):
+            results[index] = probe_camera(index, order, open_capture, label, pool)
+
+        thread = threading.Thread(target=probe, daemon=True, name=f"camera-probe-{index}")
+        thread.start()
+        threads.append((index, thread))
+
+    deadline = time.monotonic() + timeout
+    for index, thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+        if thread.is_alive():
+            print(f"[WARNING] Camera {index} did not answer within {timeout:.1f}s, skipped")
+
+    return [results[index] for index, _ in threads if results.get(index)]
+
+
+class CameraCache:
+    """Last known-good cameras, so the selection dialog can fill before probing finishes"""
+
+    def __init__(self, path=CAMERA_CACHE_PATH):
+        self.path = path
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                cameras = json.load(f)
+            return [c for c in cameras if isinstance(c, dict) and 'index' in c]
+        except (OSError, ValueError):
+            return []
+
+    def save(self, cameras):
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'w') as f:
+                json.dump(cameras, f, indent=4)
+        except OSError as e:
+            print(f"[WARNING] Could not save camera cache: {e}")
+
+    def preferred_backends(self):
+        """index -> backend that worked last time"""
+        return {c['index']: c.get('backend') for c in self.load()}
\ No newline at end of file
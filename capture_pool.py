@@ -0,0 +1,110 @@
+# core/capture_pool.py
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import cv2
+
+MAX_PARKED = 2           # open cameras kept around for reuse
+IDLE_TIMEOUT = 30.0      # seconds a parked camera stays open
+
+
+def default_backend():
+    """Backend used when nothing better is known for a webcam"""
+    # DirectShow opens much faster than the default backend on Windows
+    return cv2.CAP_DSHOW if sys.platform.startswith('win') else cv2.CAP_ANY
+
+
+def configure_capture(cap):
+    """Webcam settings shared by discovery, testing and playback"""
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    cap.set(cv2.CAP_PROP_FPS, 30)
+    return cap
+
+
+class CapturePool:
+    """Open webcam handles handed between discovery, the camera test and VideoHandler.
+
+    Opening a USB camera can take seconds, so whoever is done with a
+    working handle parks it here and the next user of the same index
+    takes it over already open and configured. Parked handles are
+    released after IDLE_TIMEOUT or when more than MAX_PARKED are held.
+    """
+
+    def __init__(self, open_capture=None, max_parked=MAX_PARKED, idle_timeout=IDLE_TIMEOUT):
+        self.open_capture = open_capture or cv2.VideoCapture
+        self.max_parked = max_parked
+        self.idle_timeout = idle_timeout
+        self.reused = 0
+        self.opened = 0
+        self._parked = OrderedDict()  # index -> (cap, backend, parked at)
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def acquire(self, index, backend=None):
+        """An open capture for `index`: a parked one if available, otherwise a new one"""
+        with self._lock:
+            entry = self._parked.pop(index, None)
+        if entry is not None:
+            cap = entry[0]
+            if cap.isOpened():
+                self.reused += 1
+                return cap
+            cap.release()
+        self.opened += 1
+        cap = self.open_capture(index, default_backend() if backend is None else backend)
+        if cap.isOpened():
+            configure_capture(cap)
+        return cap
+
+    def park(self, index, cap, backend=None):
+        """Keep an open capture for the next acquire() of the same index"""
+        if cap is None or not cap.isOpened():
+            return
+        with self._lock:
+            previous = self._parked.pop(index, None)
+            self._parked[index] = (cap, backend, time.monotonic())
+            evicted = [previous] if previous is not None and previous[0] is not cap else []
+            while len(self._parked) > self.max_parked:
+                evicted.append(self._parked.popitem(last=False)[1])
+            self._schedule_expiry()
+        for entry in evicted:
+            entry[0].release()
+
+    def parked_backend(self, index):
+        with self._lock:
+            entry = self._parked.get(index)
+        return entry[1] if entry else None
+
+    def _schedule_expiry(self):
+        if self._timer is None and self._parked:
+            oldest = min(parked_at for _, _, parked_at in self._parked.values())
+            delay = max(0.0, oldest + self.idle_timeout - time.monotonic())
+            self._timer = threading.Timer(delay, self._expire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _expire(self):
+        now = time.monotonic()
+        with self._lock:
+            self._timer = None
+            expired = [index for index, (_, _, parked_at) in self._parked.items()
+                       if now - parked_at >= self.idle_timeout]
+            entries = [self._parked.pop(index) for index in expired]
+            self._schedule_expiry()
+        for cap, _, _ in entries:
+            cap.release()
+
+    def release_all(self):
+        with self._lock:
+            entries = list(self._parked.values())
+            self._parked.clear()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for cap, _, _ in entries:
+            cap.release()
+
+
+capture_pool = CapturePool()
\ No newline at end of file
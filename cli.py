@@ -0,0 +1,180 @@
+import argparse
+import os
+import sys
+import time
+
+from utils.config import ConfigManager
+from utils.helpers import resource_path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Count vehicles in recorded videos without the GUI"
+    )
+    parser.add_argument("videos", nargs="+", help="Video files or directories of videos to process")
+    parser.add_argument("-o", "--output-dir", default="data",
+                        help="Directory for the detection and count CSV files")
+    parser.add_argument("--config", default="config.json",
+                        help="Settings file saved by the GUI (line position, confidence, ...)")
+    parser.add_argument("--model", default=resource_path('models/best1.pt'),
+                        help="YOLO weights to load")
+    parser.add_argument("--conf", type=float, default=None,
+                        help="Override the confidence threshold from the config")
+    parser.add_argument("--start", default=None,
+                        help="Start timestamp 'YYYY-mm-dd HH:MM:SS' (defaults to the file's "
+                             "modification time minus its duration)")
+    parser.add_argument("--batch-size", type=int, nargs="+", default=None,
+                        help="Frames per inference batch; several values run a throughput comparison")
+    parser.add_argument("--backend", choices=["pytorch", "onnx", "openvino"], default=None,
+                        help="Inference backend; exported models are cached next to the weights")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="CPU threads for inference in sequential mode (0 = library default)")
+    parser.add_argument("--imgsz", type=int, default=None,
+                        help="Override the inference size from the config (multiple of 32)")
+    parser.add_argument("--motion-gate", action="store_true",
+                        help="Skip inference on frames without motion between the counting lines")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes; each counts whole files with its own model")
+    parser.add_argument("--threads-per-worker", type=int, default=1,
+                        help="Torch/OpenCV threads inside each worker process")
+    return parser.parse_args(argv)
+
+
+def write_results(result, output_dir, stem=None):
+    """Write the detection rows and the In/Out counts of one video as CSV"""
+    import pandas as pd
+
+    stem = stem or os.path.splitext(os.path.basename(result["source"]))[0]
+
+    rows_path = os.path.join(output_dir, f"{stem}_detections.csv")
+    pd.DataFrame(result["rows"], columns=["Timestamp", "Vehicle ID", "Class", "Direction"]).to_csv(
+        rows_path, index=False
+    )
+
+    counts_path = os.path.join(output_dir, f"{stem}_counts.csv")
+    counts_data = [[golongan, counts["In"], counts["Out"]] for golongan, counts in result["counts"].items()]
+    pd.DataFrame(counts_data, columns=["Golongan", "In", "Out"]).to_csv(counts_path, index=False)
+    return rows_path, counts_path
+
+
+def main(argv=None):
+    """Headless entry point: count every video given on the command line"""
+    args = parse_args(argv)
+
+    config_manager = ConfigManager()
+    config_manager.config_file = args.config
+    settings = config_manager.load_config()
+    if args.conf is not None:
+        settings["confidence_threshold"] = args.conf
+    if args.start:
+        settings["start_timestamp_user"] = args.start
+    if args.motion_gate:
+        settings["enable_motion_gate"] = True
+    if args.imgsz:
+        settings["inference_imgsz"] = args.imgsz
+    if args.backend:
+        settings["inference_backend"] = args.backend
+    if args.threads is not None:
+        settings["inference_threads"] = args.threads
+
+    batch_sizes = args.batch_size or [settings.get("offline_batch_size", 1)]
+    if any(size < 1 for size in batch_sizes):
+        print("[ERROR] --batch-size must be at least 1")
+        return 2
+
+    # Pulls in pandas, numpy and cv2, so only once --help and argument errors are out of the way
+    from core.job_runner import find_videos, video_labels
+
+    videos = find_videos(args.videos)
+    if not videos:
+        print("[ERROR] No video files found")
+        return 2
+    # Same-named recordings from different folders must not overwrite each other
+    labels = video_labels(videos)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    if args.workers > 1:
+        return run_parallel(args, videos, settings, batch_sizes, labels)
+
+    # Heavy imports only once the arguments are known to be valid
+    from core.model_loader import load_model
+    from core.video_counter import count_video_file
+
+    model = load_model(args.model, settings)
+
+    throughput = {}
+    failed = 0
+    for batch_size in batch_sizes:
+        total_frames = 0
+        total_elapsed = 0.0
+        results = []
+        for path in videos:
+            print(f"[INFO] Processing {path} (batch size {batch_size})")
+            try:
+                result = count_video_file(path, model, settings, batch_size=batch_size)
+            except Exception as e:
+                print(f"[ERROR] {path}: {e}")
+                failed += 1
+                continue
+
+            rows_path, counts_path = write_results(result, args.output_dir, labels[path][1])
+            fps = result["frames"] / result["elapsed"] if result["elapsed"] > 0 else 0.0
+            print(f"[INFO] {path}: {len(result['rows'])} vehicles, {result['frames']} frames "
+                  f"in {result['elapsed']:.1f}s ({fps:.1f} fps)")
+            if result["motion_gate"]:
+                print(f"[INFO] {result['motion_gate']}")
+            print(f"[INFO] Saved {rows_path} and {counts_path}")
+            total_frames += result["frames"]
+            total_elapsed += result["elapsed"]
+            results.append(result)
+        throughput[batch_size] = (total_frames, total_elapsed)
+        write_combined(results, args.output_dir, labels)
+
+    print_throughput(throughput)
+    return 1 if failed else 0
+
+
+def run_parallel(args, videos, settings, batch_sizes, labels):
+    """Spread the videos over a process pool, once per batch size"""
+    from core.job_runner import run_jobs
+
+    throughput = {}
+    failed = 0
+    for batch_size in batch_sizes:
+        started = time.perf_counter()
+        results, failures = run_jobs(
+            videos, args.model, settings,
+            workers=args.workers,
+            threads_per_worker=args.threads_per_worker,
+            batch_size=batch_size,
+            on_result=lambda result: write_results(result, args.output_dir, labels[result["source"]][1])
+        )
+        throughput[batch_size] = (sum(result["frames"] for result in results), time.perf_counter() - started)
+        failed += len(failures)
+        write_combined(results, args.output_dir, labels)
+
+    print_throughput(throughput)
+    return 1 if failed else 0
+
+
+def write_combined(results, output_dir, labels=None):
+    """Write all detections of a run into one CSV tagged by source file"""
+    if not results:
+        return
+    from core.job_runner import combine_results
+
+    combined_path = os.path.join(output_dir, "combined_detections.csv")
+    combine_results(results, labels).to_csv(combined_path, index=False)
+    print(f"[INFO] Saved {combined_path}")
+
+
+def print_throughput(throughput):
+    print("[INFO] Throughput per batch size:")
+    for batch_size, (total_frames, total_elapsed) in throughput.items():
+        fps = total_frames / total_elapsed if total_elapsed > 0 else 0.0
+        print(f"  batch {batch_size:>3}: {total_frames} frames in {total_elapsed:.1f}s ({fps:.1f} fps)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -1,5 +1,4 @@
 import json
-from tkinter import messagebox
 
 from .constants import MAX_DISPLAY_WIDTH, MAX_DISPLAY_HEIGHT
 
@@ -14,6 +13,21 @@ class ConfigManager:
             "line1_y": (MAX_DISPLAY_HEIGHT // 2) - 25,
             "line1_x": (MAX_DISPLAY_WIDTH // 2) - 25,
             "video_playback_speed": 1.0,
+            "offline_batch_size": 8,
+            "inference_imgsz": 640,
+            "inference_backend": "pytorch",
+            "inference_threads": 0,
+            "enable_motion_gate": False,
+            "motion_threshold": 0.002,
+            "motion_hold_frames": 15,
+            "enable_roi_filter": False,
+            "roi_mode": "band",
+            "roi_band_margin": 0.25,
+            "roi_margin_y_top": 0.3,
+            "roi_margin_x": 0.1,
+            "roi_polygon": [],
+            "overlay_level": "full",
+            "preview_fps": 15,
             "start_timestamp_user": None
         }
 
@@ -29,11 +43,14 @@ class ConfigManager:
         except (FileNotFoundError, json.JSONDecodeError):
             return self.default_settings.copy()
 
-    def save_config(self, settings):
-        """Save configuration to file"""
+    def save_config(self, settings, quiet=False):
+        """Save configuration to file; quiet skips the confirmation box (errors are still shown)"""
+        from tkinter import messagebox
+
         try:
             with open(self.config_file, 'w') as f:
                 json.dump(settings, f, indent=4)
-            messagebox.showinfo("Info", "Config saved.")
+            if not quiet:
+                messagebox.showinfo("Info", "Config saved.")
         except Exception as e:
             messagebox.showerror("Error", f"Error saving config: {e}")
\ No newline at end of file
@@ -8,7 +8,12 @@ WEBCAM_BUFFER_SIZE = 1
 
 # Queue constants
 FRAME_QUEUE_SIZE = 5
+FRAME_RING_SLOTS = FRAME_QUEUE_SIZE + 2  # queued frames + one in inference + one being written
+PREVIEW_STASH_SIZE = FRAME_RING_SLOTS + 2  # display copies of frames in flight (recycled frames drop theirs)
 RESULT_QUEUE_TIMEOUT = 20  # milliseconds
+RESULT_QUEUE_SIZE = 64
+RESULT_DRAIN_LIMIT = 256  # messages handled per GUI tick at most
+EVENT_LOG_FLUSH_INTERVAL = 1000  # milliseconds until a partial batch of detections is committed
 
 # Animation constants
 LOADING_ANIMATION_DELAY = 50  # milliseconds
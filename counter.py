@@ -0,0 +1,213 @@
+# core/counter.py
+import numpy as np
+from collections import deque
+from datetime import datetime, timedelta
+
+# Line positions in the settings are expressed in these display coordinates
+MAX_DISPLAY_WIDTH = 960
+MAX_DISPLAY_HEIGHT = 720
+
+GOLONGAN_LIST = ["Gol 1", "Gol 2", "Gol 3", "Gol 4", "Gol 5", "Motor"]
+LINE_TOLERANCE = 25       # pixels between trigger point and line
+TRACK_TIMEOUT_FRAMES = 30  # frames before an unseen track is forgotten
+DEFAULT_COUNT_FPS = 30
+TRACK_TABLE_CAPACITY = 256  # initial slots, doubled when full
+DIRECTIONS = ("In", "Out")
+
+
+def resolve_start_time(settings, fallback=None):
+    """Return the datetime the first frame corresponds to"""
+    if settings.get("start_timestamp_user"):
+        try:
+            start_time = datetime.strptime(settings["start_timestamp_user"], "%Y-%m-%d %H:%M:%S")
+            print(f"[INFO] Using custom start timestamp: {start_time}")
+            return start_time
+        except ValueError:
+            print(f"[WARNING] Invalid start_timestamp_user: {settings['start_timestamp_user']}")
+    return fallback or datetime.now()
+
+
+def compute_line_positions(settings, frame_shape):
+    """Scale the configured counting lines to the frame resolution"""
+    (h_orig, w_orig) = frame_shape[:2]
+    line_offset_scaled = int(settings['line_offset'] * (h_orig / MAX_DISPLAY_HEIGHT))
+    if settings['line_orientation'] == "Horizontal":
+        line1_pos = int(settings['line1_y'] * (h_orig / MAX_DISPLAY_HEIGHT))
+    else:
+        line1_pos = int(settings['line1_x'] * (w_orig / MAX_DISPLAY_WIDTH))
+    return line1_pos, line1_pos + line_offset_scaled
+
+
+def extract_tracks(result):
+    """Pull track ids, class ids and xyxy boxes out of an ultralytics result"""
+    if result.boxes.id is None:
+        return [], [], []
+    track_ids = result.boxes.id.int().cpu().tolist()
+    class_ids = result.boxes.cls.int().cpu().tolist()
+    boxes = result.boxes.xyxy.cpu().numpy()
+    return track_ids, class_ids, boxes
+
+
+class VehicleCounter:
+    """Per-track line crossing state machine.
+
+    A track is armed when its trigger point first lands on one of the two
+    lines and is counted once it reaches the other one.
+
+    Track state lives in fixed-capacity arrays indexed by slot, with a
+    sorted id index for lookups, so a frame costs a handful of vectorized
+    operations however many objects are tracked. Tracks are expired from
+    per-frame buckets instead of rescanning the table.
+    """
+
+    def __init__(self, class_names, start_time=None, fps=DEFAULT_COUNT_FPS, capacity=TRACK_TABLE_CAPACITY):
+        self.class_names = class_names
+        self.start_time = start_time or datetime.now()
+        self.fps = fps
+        self.frame_num = 0
+
+        # Class id -> index in GOLONGAN_LIST, -1 for Unknown
+        names = class_names.items() if isinstance(class_names, dict) else enumerate(class_names)
+        names = dict(names)
+        self._class_golongan = np.full(max(names, default=-1) + 2, -1, dtype=np.int16)
+        for class_id, name in names.items():
+            if name in GOLONGAN_LIST:
+                self._class_golongan[class_id] = GOLONGAN_LIST.index(name)
+        self._counts = np.zeros((len(GOLONGAN_LIST), len(DIRECTIONS)), dtype=np.int64)
+
+        # Track table
+        self._ids = np.full(capacity, -1, dtype=np.int64)
+        self._line = np.zeros(capacity, dtype=np.int8)
+        self._golongan = np.full(capacity, -1, dtype=np.int16)
+        self._counted = np.zeros(capacity, dtype=bool)
+        self._last_seen = np.zeros(capacity, dtype=np.int64)
+        self._free = list(range(capacity - 1, -1, -1))
+
+        # Sorted ids of live tracks and their slots
+        self._index_ids = np.empty(0, dtype=np.int64)
+        self._index_slots = np.empty(0, dtype=np.int64)
+
+        # (frame, slots stamped on that frame) for expiry
+        self._seen_buckets = deque()
+
+    @property
+    def vehicle_counts(self):
+        return self.counts_snapshot()
+
+    @property
+    def active_tracks(self):
+        return len(self._index_ids)
+
+    def counts_snapshot(self):
+        """Copy of the per-golongan In/Out counts"""
+        return {golongan: {direction: int(self._counts[g, d]) for d, direction in enumerate(DIRECTIONS)}
+                for g, golongan in enumerate(GOLONGAN_LIST)}
+
+    def _grow(self):
+        capacity = len(self._ids)
+        self._ids = np.concatenate([self._ids, np.full(capacity, -1, dtype=np.int64)])
+        self._line = np.concatenate([self._line, np.zeros(capacity, dtype=np.int8)])
+        self._golongan = np.concatenate([self._golongan, np.full(capacity, -1, dtype=np.int16)])
+        self._counted = np.concatenate([self._counted, np.zeros(capacity, dtype=bool)])
+        self._last_seen = np.concatenate([self._last_seen, np.zeros(capacity, dtype=np.int64)])
+        self._free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    def _lookup(self, ids):
+        """Slots of the given ids and a mask of which ones are known"""
+        if len(self._index_ids) == 0:
+            return np.zeros(len(ids), dtype=np.int64), np.zeros(len(ids), dtype=bool)
+        pos = np.searchsorted(self._index_ids, ids)
+        pos = np.minimum(pos, len(self._index_ids) - 1)
+        found = self._index_ids[pos] == ids
+        return self._index_slots[pos], found
+
+    def _insert(self, ids, lines, golongan):
+        while len(self._free) < len(ids):
+            self._grow()
+        slots = np.array([self._free.pop() for _ in range(len(ids))], dtype=np.int64)
+        self._ids[slots] = ids
+        self._line[slots] = lines
+        self._golongan[slots] = golongan
+        self._counted[slots] = False
+        self._last_seen[slots] = self.frame_num
+
+        order = np.argsort(ids)
+        pos = np.searchsorted(self._index_ids, ids[order])
+        self._index_ids = np.insert(self._index_ids, pos, ids[order])
+        self._index_slots = np.insert(self._index_slots, pos, slots[order])
+        return slots
+
+    def _expire(self):
+        """Drop tracks not seen for more than TRACK_TIMEOUT_FRAMES frames"""
+        cutoff = self.frame_num - TRACK_TIMEOUT_FRAMES
+        while self._seen_buckets and self._seen_buckets[0][0] < cutoff:
+            bucket_frame, slots = self._seen_buckets.popleft()
+            # Slots seen again later (or reused) carry a newer stamp
+            stale = slots[(self._last_seen[slots] == bucket_frame) & (self._ids[slots] >= 0)]
+            if len(stale) == 0:
+                continue
+            keep = ~np.isin(self._index_ids, self._ids[stale])
+            self._index_ids = self._index_ids[keep]
+            self._index_slots = self._index_slots[keep]
+            self._ids[stale] = -1
+            self._free.extend(stale.tolist())
+
+    def advance(self):
+        """Move the frame clock past a frame that was not sent to the detector"""
+        self._expire()
+        self.frame_num += 1
+
+    def update(self, track_ids, class_ids, boxes, line1_pos, line2_pos, orientation):
+        """Feed the tracks of one frame and return the rows counted on it"""
+        new_rows = []
+        frame_num = self.frame_num
+
+        if len(track_ids):
+            ids = np.asarray(track_ids, dtype=np.int64)
+            boxes = np.asarray(boxes, dtype=np.float64)
+            if orientation == "Horizontal":
+                trigger = boxes[:, 3].astype(np.int64)
+            else:
+                trigger = ((boxes[:, 0] + boxes[:, 2]) / 2).astype(np.int64)
+            near1 = np.abs(trigger - line1_pos) < LINE_TOLERANCE
+            near2 = np.abs(trigger - line2_pos) < LINE_TOLERANCE
+
+            slots, found = self._lookup(ids)
+            known = slots[found]
+            self._last_seen[known] = frame_num
+            stamped = [known]
+
+            # Armed tracks reaching the opposite line
+            pending = found & ~self._counted[slots]
+            line = self._line[slots]
+            crossed_in = pending & (line == 1) & near2
+            crossed_out = pending & (line == 2) & near1
+            crossed = np.flatnonzero(crossed_in | crossed_out)
+            if len(crossed):
+                crossed_slots = slots[crossed]
+                self._counted[crossed_slots] = True
+                golongan = self._golongan[crossed_slots]
+                direction = np.where(crossed_in[crossed], 0, 1)
+                valid = golongan >= 0
+                np.add.at(self._counts, (golongan[valid], direction[valid]), 1)
+
+                timestamp = (self.start_time + timedelta(seconds=frame_num / self.fps)).strftime("%Y-%m-%d %H:%M:%S")
+                for track_id, g, d in zip(ids[crossed].tolist(), golongan.tolist(), direction.tolist()):
+                    new_rows.append({"Timestamp": timestamp, "Vehicle ID": track_id,
+                                     "Class": GOLONGAN_LIST[g] if g >= 0 else "Unknown",
+                                     "Direction": DIRECTIONS[d]})
+
+            # Unknown tracks touching a line get armed
+            arming = np.flatnonzero(~found & (near1 | near2))
+            if len(arming):
+                cls = np.asarray(class_ids, dtype=np.int64)[arming]
+                # Out-of-range ids land on the trailing -1 (Unknown) entry
+                cls = np.clip(cls, -1, len(self._class_golongan) - 1)
+                stamped.append(self._insert(ids[arming], np.where(near1[arming], 1, 2),
+                                            self._class_golongan[cls]))
+
+            self._seen_buckets.append((frame_num, np.concatenate(stamped)))
+
+        self._expire()
+        self.frame_num += 1
+        return new_rows
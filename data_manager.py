@@ -1,10 +1,22 @@
-import pandas as pd
+from tkinter import messagebox
+
+from core.detection_store import DetectionStore
+from core.event_log import EventLog
+from core.rollups import Rollups
+from utils.constants import EVENT_LOG_FLUSH_INTERVAL
 
 
 class DataManager:
     def __init__(self, app):
         self.app = app
-        self.df = pd.DataFrame(columns=["Timestamp", "Vehicle ID", "Class", "Direction"])
+        self.store = DetectionStore()
+        self.rollups = Rollups()
+        self.event_log = None
+        self._flush_job = None
+        try:
+            self.event_log = EventLog()
+        except Exception as e:
+            print(f"[WARNING] Detection log disabled, counts only kept in memory: {e}")
         self.golongan_list = ["Gol 1", "Gol 2", "Gol 3", "Gol 4", "Gol 5", "Motor"]
         self.vehicle_counts = {golongan: {"In": 0, "Out": 0} for golongan in self.golongan_list}
 
@@ -12,7 +24,10 @@ class DataManager:
         """Reset data - either all data or just counts"""
         if clear_all:
             # If clear_all=True, clear all data
-            self.df = self.df.iloc[0:0]
+            self.store.clear()
+            self.rollups.clear()
+            if self.event_log:
+                self.event_log.end_session()
             self.vehicle_counts = {golongan: {"In": 0, "Out": 0} for golongan in self.golongan_list}
         else:
             # If clear_all=False (default), only reset count for new video
@@ -20,25 +35,84 @@ class DataManager:
 
         self.update_gui_display()
 
+    @property
+    def df(self):
+        """All detections as a DataFrame, built only when asked for"""
+        return self.store.to_frame()
+
     def update_gui_display(self):
         """Update GUI display with current data"""
-        # Clear existing items
-        for i in self.app.ui_components.tree.get_children(): 
-            self.app.ui_components.tree.delete(i)
-        
-        # Add new items
-        for _, row in self.df.iterrows():
-            self.app.ui_components.tree.insert("", "end", values=list(row))
-        
-        # Scroll to bottom if there's data
-        if not self.df.empty: 
-            self.app.ui_components.tree.yview_moveto(1)
+        # Only rows that arrived since the last update touch the table
+        self.app.ui_components.table.set_total(len(self.store))
+
+    def get_rows(self, start, stop):
+        """Table values for rows [start, stop)"""
+        return self.store.rows(start, stop)
 
     def add_detection_data(self, new_rows):
         """Add new detection data"""
-        new_df = pd.DataFrame(new_rows)
-        self.df = pd.concat([self.df, new_df], ignore_index=True)
+        self.store.append_rows(new_rows)
+        self.rollups.add_rows(new_rows, self.app.settings)
+        self._log_rows(new_rows)
+        self.update_gui_display()
+
+    def _log_rows(self, rows):
+        """Write rows to the on-disk log; a partial batch is committed shortly after"""
+        if not self.event_log:
+            return
+        try:
+            pending = self.event_log.append(rows, self.app.video_handler.video_source, self.app.settings)
+        except Exception as e:
+            print(f"[ERROR] Could not write detection log: {e}")
+            return
+        if pending and self._flush_job is None:
+            self._flush_job = self.app.root.after(EVENT_LOG_FLUSH_INTERVAL, self._flush_log)
+
+    def _flush_log(self):
+        self._flush_job = None
+        try:
+            self.event_log.flush()
+        except Exception as e:
+            print(f"[ERROR] Could not write detection log: {e}")
+
+    def offer_recovery(self):
+        """Offer to restore detections of a session that did not end cleanly"""
+        # Only before this run has logged anything itself
+        if not self.event_log or self.event_log.session_id is not None:
+            return
+        unfinished = self.event_log.unfinished_session()
+        if not unfinished:
+            return
+        session_id, source, started, count = unfinished
+        if not messagebox.askyesno(
+                "Recover Session",
+                f"The previous session did not close cleanly.\n\n"
+                f"Started: {started}\nSource: {source or 'unknown'}\nDetections: {count}\n\n"
+                f"Recover its data?"):
+            self.event_log.close_unfinished()
+            return
+
+        rows = self.event_log.load_session(session_id)
+        self.store.clear()
+        self.store.append_rows(rows)
+        self.rollups.clear()
+        self.rollups.add_rows(rows, self.app.settings)
+        self.vehicle_counts = {golongan: {"In": 0, "Out": 0} for golongan in self.golongan_list}
+        for row in rows:
+            if row["Class"] in self.vehicle_counts:
+                self.vehicle_counts[row["Class"]][row["Direction"]] += 1
+        # New detections keep going into the recovered session
+        self.event_log.resume_session(session_id)
         self.update_gui_display()
+        print(f"[INFO] Recovered {len(rows)} detections from session {session_id}")
+
+    def close(self):
+        """Commit and close the detection log on a clean exit"""
+        if self._flush_job:
+            self.app.root.after_cancel(self._flush_job)
+            self._flush_job = None
+        if self.event_log:
+            self.event_log.close()
 
     def get_export_data(self):
         """Get data for export"""
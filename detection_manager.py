@@ -1,29 +1,69 @@
 import threading
 import time
 import cv2
+from collections import OrderedDict
 from tkinter import messagebox
 from multiprocessing import Process, Queue, Event
 from queue import Empty, Full
 from PIL import Image, ImageTk, ImageDraw
-import pandas as pd
 
 from core.detection_process import detection_process
-from utils.constants import MAX_DISPLAY_WIDTH, MAX_DISPLAY_HEIGHT
+from core.frame_ring import FrameRing
+from core.preview import PreviewChannel
+from gui.overlay import draw_overlays
+from utils.constants import (MAX_DISPLAY_WIDTH, MAX_DISPLAY_HEIGHT, FRAME_RING_SLOTS, PREVIEW_STASH_SIZE,
+                             RESULT_QUEUE_SIZE, RESULT_QUEUE_TIMEOUT, RESULT_DRAIN_LIMIT)
 from utils.helpers import format_time
+from utils import startup_profile
 
 
 class DetectionManager:
     def __init__(self, app):
         self.app = app
+        self.control_q = Queue()
         self.frame_q = Queue(maxsize=5)
-        self.result_q = Queue()
+        # Bounded: the worker drops (and counts) preview metadata when the GUI lags
+        self.result_q = Queue(maxsize=RESULT_QUEUE_SIZE)
         self.detection_proc = None
         self.stop_event = Event()
+        self.worker_ready = False
         self.running = False
         self.is_loading = False
         self.animation_job = None
         self.video_feed_thread = None
-        self._shutdown_attempts = 0
+        self.frame_ring = None
+        self.ring_source = None
+        self.session = 0
+        self.ring_session = 0  # first session using the current ring
+        self.results_job = None
+        self.worker_dropped = 0
+        self.results_coalesced = 0
+        self.class_names = {}
+        # Display-sized previews of frames in flight, keyed by frame sequence number
+        self.preview_channel = None
+        self.preview_frames = OrderedDict()
+        self.preview_lock = threading.Lock()
+
+    def start_worker(self):
+        """Start the detection worker once; it keeps the model loaded until exit"""
+        if self.detection_proc and self.detection_proc.is_alive():
+            return
+        self.worker_ready = False
+        # A new worker has no ring yet: the next session must send new_source, not reset
+        self._close_rings((self.frame_ring,))
+        self.frame_ring = self.ring_source = None
+        self.stop_event.clear()
+        self.detection_proc = Process(
+            target=detection_process,
+            args=(self.control_q, self.frame_q, self.result_q, self.stop_event, self.app.settings.copy()),
+            daemon=True
+        )
+        self.detection_proc.start()
+        if self.results_job is None:
+            self.process_results()
+
+    def worker_alive(self):
+        return self.detection_proc is not None and self.detection_proc.is_alive()
 
     def toggle_detection(self):
         """Toggle detection on/off"""
@@ -51,6 +91,14 @@ class DetectionManager:
                 return
 
         self.app.data_manager.reset_data()
+
+        if not self.worker_alive():
+            self.start_worker()
+        if self.worker_ready:
+            self._begin_session()
+            return
+
+        # The model is still loading; the session starts on model_ready
         self.is_loading = True
         self.app.ui_components.start_stop_button.config(
             text="Loading...", 
@@ -59,24 +107,50 @@ class DetectionManager:
         )
         self.update_animation_frame()
 
-        self.stop_event.clear()
-        self.frame_q = Queue(maxsize=5)
-        self.result_q = Queue()
+    def _begin_session(self):
+        """Point the warm worker at the current source and start feeding frames"""
+        self.session += 1
+        self.worker_dropped = 0
+        self.results_coalesced = 0
+        settings = self.app.settings.copy()
+
+        # Frames travel through shared memory, the queues only carry slot indices.
+        # The ring is only rebuilt when the source or its frame size changes.
+        frame_shape = self.app.video_handler.get_frame_shape()
+        source_key = (self.app.video_handler.video_source, tuple(frame_shape))
+        if self.frame_ring is None or source_key != self.ring_source:
+            old_ring = self.frame_ring
+            self.frame_ring = FrameRing(frame_shape, FRAME_RING_SLOTS)
+            self.ring_source = source_key
+            self.ring_session = self.session
+            self.control_q.put({"type": "new_source", "session": self.session, "settings": settings,
+                                "frame_ring": self.frame_ring})
+            self._close_rings((old_ring,))
+        else:
+            self.control_q.put({"type": "reset", "session": self.session, "settings": settings})
+        self.control_q.put({"type": "resume"})
+        self.update_preview_settings()
 
         # Only set frame delay for video files
         if not self.app.video_handler.is_webcam:
             self.app.video_handler.frame_delay = ((1.0 / self.app.video_handler.video_fps) / 
                                                  self.app.settings['video_playback_speed'])
 
-        self.detection_proc = Process(
-            target=detection_process,
-            args=(self.frame_q, self.result_q, self.stop_event, self.app.settings.copy())
+        self.is_loading = False
+        if self.animation_job:
+            self.app.root.after_cancel(self.animation_job)
+            self.animation_job = None
+        self.running = True
+        self.app.ui_components.start_stop_button.config(
+            text="Stop Detection", 
+            state="normal", 
+            bootstyle="danger"
         )
-        self.detection_proc.start()
-        self.process_results()
+        self.video_feed_thread = threading.Thread(target=self.video_feed_loop, daemon=True)
+        self.video_feed_thread.start()
 
     def stop_detection(self):
-        """Stop detection process"""
+        """Stop feeding frames and pause the worker; the model stays loaded"""
         self.running = False
         self.is_loading = False
 
@@ -85,13 +159,15 @@ class DetectionManager:
             self.app.root.after_cancel(self.animation_job)
             self.animation_job = None
 
-        # Signal detection process to stop
-        if self.detection_proc and self.detection_proc.is_alive():
-            self.stop_event.set()
-            self._shutdown_attempts = 0
-            self.app.root.after(100, self._check_process_shutdown)
-        else:
-            self.detection_proc = None
+        if self.video_feed_thread and self.video_feed_thread.is_alive():
+            self.video_feed_thread.join(timeout=1.0)
+        self.app.video_handler.stop_live_capture()
+        if self.worker_alive():
+            self.control_q.put({"type": "pause"})
+        if self.preview_channel:
+            print(f"[INFO] {self.preview_channel.summary()}")
+            print(f"[INFO] Results dropped by the worker: {self.worker_dropped}, "
+                  f"coalesced in the GUI: {self.results_coalesced}")
 
         # Reset button
         self.app.ui_components.start_stop_button.config(
@@ -100,37 +176,58 @@ class DetectionManager:
             bootstyle="success"
         )
 
-        # Clear queues
-        for q in [self.result_q, self.frame_q]:
-            while not q.empty():
-                try:
-                    q.get_nowait()
-                except Exception:
-                    break
+        self._drain_queues()
+        with self.preview_lock:
+            self.preview_frames.clear()
 
         # Only display first frame for video files
         if (self.app.video_handler.video_source is not None and 
             not self.app.video_handler.is_webcam):
             self.app.video_handler.display_first_frame()
 
-    def _check_process_shutdown(self):
-        """Check if detection process has shut down"""
-        if not self.detection_proc:
-            return
+    def update_preview_settings(self):
+        """(Re)build the preview channel from the current settings"""
+        self.preview_channel = PreviewChannel.from_settings(
+            self.app.settings, (MAX_DISPLAY_WIDTH, MAX_DISPLAY_HEIGHT))
 
-        if self.detection_proc.is_alive():
-            self._shutdown_attempts += 1
-            if self._shutdown_attempts > 20:
-                print("[WARNING] Detection process did not stop gracefully. Terminating.")
-                self.detection_proc.terminate()
-                self.detection_proc.join()
-                self.detection_proc = None
-            else:
-                self.app.root.after(100, self._check_process_shutdown)
-        else:
-            print("Detection process stopped gracefully.")
-            self.detection_proc.join()
-            self.detection_proc = None
+    def _drain_queues(self):
+        """Drop pending frames and previews, handing frame slots back to the ring.
+
+        Counted rows of the current session are still stored; rows the
+        worker flushes after this arrive through process_results.
+        """
+        while True:
+            try:
+                _, frame_ring_session, _, slot, _, _ = self.frame_q.get_nowait()
+            except Exception:
+                break
+            if self.frame_ring is not None and frame_ring_session == self.ring_session:
+                self.frame_ring.release(slot)
+        while True:
+            try:
+                result = self.result_q.get_nowait()
+            except Exception:
+                break
+            if result['type'] == 'model_ready':
+                self.worker_ready = True
+                self.class_names = result['names']
+            elif result['type'] == 'data_update' and result['session'] == self.session:
+                # Counted rows are kept even though the session has stopped
+                self._store_rows(result['counts'], result['new_rows'])
+
+    def _store_rows(self, counts, new_rows):
+        """Hand counted rows and the latest totals to the data manager"""
+        if new_rows:
+            self.app.data_manager.vehicle_counts = counts
+            self.app.data_manager.add_detection_data(new_rows)
+
+    def _close_rings(self, rings):
+        """Release shared frame slots after the feed thread has exited"""
+        if self.video_feed_thread and self.video_feed_thread.is_alive():
+            self.video_feed_thread.join(timeout=1.0)
+        for ring in rings:
+            if ring is not None:
+                ring.close()
 
     def create_loading_frame(self, angle):
         """Create loading animation frame"""
@@ -154,41 +251,83 @@ class DetectionManager:
 
     def video_feed_loop(self):
         """Optimized video feed loop"""
-        frame_skip_counter = 0
+        frame_ring = self.frame_ring
+        ring_session = self.ring_session
+        session = self.session
+        seq = 0
+        live = self.app.video_handler.is_webcam
+        carried_settings = None  # settings update of a frame that was recycled before the worker saw it
+        if not self.app.video_handler.cap or not self.app.video_handler.cap.isOpened():
+            self.app.root.after(0, self.stop_detection)
+            return
+        if self.app.video_handler.is_webcam:
+            # Live sources are drained by a grabber thread; we always take its newest frame
+            read_frame = self.app.video_handler.start_live_capture().read
+        else:
+            read_frame = self.app.video_handler.cap.read
         while self.running:
             start_time = time.time()
-            
-            if not self.app.video_handler.cap or not self.app.video_handler.cap.isOpened():
-                self.app.root.after(0, self.stop_detection)
-                break
 
-            ret, frame = self.app.video_handler.cap.read()
+            seek = self.app.video_handler.take_pending_seek()
+            if seek is not None:
+                self.app.video_handler.cap.set(cv2.CAP_PROP_POS_FRAMES, seek)
+
+            ret, frame = read_frame()
             if not ret:
                 # Only stop for video files on read failure
                 if not self.app.video_handler.is_webcam:  
                     self.app.root.after(0, self.stop_detection)
                     break
                 else:
-                    # For webcam, try to continue
-                    time.sleep(0.01)
+                    # For webcam, wait for the next frame
                     continue
 
-            # For webcam, implement frame skipping if processing is too slow
-            if self.app.video_handler.is_webcam and self.frame_q.qsize() > 2:
-                frame_skip_counter += 1
-                if frame_skip_counter % 2 == 0:  # Skip every other frame if queue is backed up
-                    continue
+            if not frame_ring.fits(frame):
+                print(f"[WARNING] Frame {frame.shape} does not fit the shared frame slots, skipping.")
+                continue
 
             try:
-                # Clear old frames from queue if it's full
-                if self.frame_q.full():
-                    try:
-                        self.frame_q.get_nowait()
-                    except Empty:
-                        pass
-
-                settings_payload = getattr(self.app, 'new_settings_to_send', None)
-                self.frame_q.put_nowait((frame, settings_payload))
+                # A live source keeps only its newest frame queued, so the worker never
+                # works through a backlog; files drop their oldest frame when the queue is full
+                while live or self.frame_q.full():
+                    pending = self._take_pending_slot()
+                    if pending is None:
+                        break
+                    slot, pending_settings = pending
+                    carried_settings = pending_settings or carried_settings
+                    if slot is not None:
+                        frame_ring.release(slot)
+                    if not live:
+                        break
+
+                slot = frame_ring.acquire()
+                if slot is None:
+                    # Every slot is taken: recycle the oldest pending frame
+                    pending = self._take_pending_slot()
+                    if pending is not None:
+                        slot, pending_settings = pending
+                        carried_settings = pending_settings or carried_settings
+                    if slot is None:
+                        continue
+
+                shape = frame_ring.write(slot, frame)
+                settings_payload = getattr(self.app, 'new_settings_to_send', None) or carried_settings
+                seq += 1
+                try:
+                    self.frame_q.put_nowait((session, ring_session, seq, slot, shape, settings_payload))
+                except Full:
+                    frame_ring.release(slot)
+                    carried_settings = settings_payload
+                    raise
+                carried_settings = None
+                # Previews are scaled down (at preview fps) right here, overlays are
+                # drawn on them once the frame's metadata arrives
+                preview = self.preview_channel.scale(frame)
+                if preview is not None:
+                    with self.preview_lock:
+                        self.preview_frames[seq] = preview
+                        while len(self.preview_frames) > PREVIEW_STASH_SIZE:
+                            self.preview_frames.popitem(last=False)
                 if hasattr(self.app, 'new_settings_to_send') and self.app.new_settings_to_send: 
                     self.app.new_settings_to_send = None
                     
@@ -196,85 +335,138 @@ class DetectionManager:
                 # Skip this frame if queue is full
                 pass
 
-            # Only apply frame delay for video files
+            # Only apply frame delay for video files, webcam reads wait for the camera
             if not self.app.video_handler.is_webcam:
                 elapsed_time = time.time() - start_time
                 sleep_time = self.app.video_handler.frame_delay - elapsed_time
                 if sleep_time > 0:
                     time.sleep(sleep_time)
-            else:
-                # For webcam, minimal delay to prevent CPU overload
-                time.sleep(0.001)
 
-    def process_results(self):
-        """Process detection results"""
+    def _take_pending_slot(self):
+        """Pull the oldest queued frame back, or None if nothing is queued.
+
+        Returns its slot (None if the slot belongs to an older ring) and the
+        settings update it carried, which has to travel with a later frame.
+        No detections will come back for it, so its preview goes too; the
+        stash only ever holds previews of frames still in flight.
+        """
         try:
-            result = self.result_q.get_nowait()
+            _, frame_ring_session, seq, slot, _, settings = self.frame_q.get_nowait()
+        except Empty:
+            return None
+        with self.preview_lock:
+            self.preview_frames.pop(seq, None)
+        return (slot if frame_ring_session == self.ring_session else None), settings
+
+    def process_results(self):
+        """Drain every pending result: one table update and one preview per tick"""
+        latest = []
+        counts = None
+        new_rows = []
+        for _ in range(RESULT_DRAIN_LIMIT):
+            try:
+                result = self.result_q.get_nowait()
+            except Empty:
+                break
 
             if result['type'] == 'model_ready':
-                self.is_loading = False
-                self.running = True
-                self.app.ui_components.start_stop_button.config(
-                    text="Stop Detection", 
-                    state="normal", 
-                    bootstyle="danger"
-                )
-                self.video_feed_thread = threading.Thread(target=self.video_feed_loop, daemon=True)
-                self.video_feed_thread.start()
+                self.worker_ready = True
+                self.class_names = result['names']
+                startup_profile.mark("detection worker ready")
+                if self.is_loading:
+                    self._begin_session()
 
             elif result['type'] == 'model_error':
                 messagebox.showerror("Model Error", f"Failed to load YOLO model: {result['error']}")
+                self.detection_proc = None
                 self.stop_detection()
+                break
 
-            elif result['type'] == 'frame' and self.running:
-                # Optimized frame display
-                img = cv2.cvtColor(result['image'], cv2.COLOR_BGR2RGB)
-                img = cv2.resize(img, (MAX_DISPLAY_WIDTH, MAX_DISPLAY_HEIGHT))
-                imgtk = ImageTk.PhotoImage(Image.fromarray(img))
-                self.app.ui_components.video_label.imgtk = imgtk
-                self.app.ui_components.video_label.configure(image=imgtk)
-
-                # Only update trackbar for video files
-                if (self.app.video_handler.cap and 
-                    self.app.video_handler.is_video_file and 
-                    not self.app.video_handler.is_webcam):
-                    current_frame = int(self.app.video_handler.cap.get(cv2.CAP_PROP_POS_FRAMES))
-                    if not self.app.video_handler.is_seeking:
-                        self.app.ui_components.trackbar_var.set(current_frame)
-
-                    total_sec = self.app.video_handler.total_frames / self.app.video_handler.video_fps
-                    current_sec = current_frame / self.app.video_handler.video_fps
-                    self.app.ui_components.time_label.config(
-                        text=f"{format_time(current_sec)} / {format_time(total_sec)}"
-                    )
-
-            elif result['type'] == 'data_update' and self.running:
-                self.app.data_manager.vehicle_counts = result['counts']
-                new_df = pd.DataFrame(result['new_rows'])
-                self.app.data_manager.df = pd.concat([self.app.data_manager.df, new_df], ignore_index=True)
-                self.app.update_gui_display()
-        except Empty:
-            pass
+            elif result['session'] != self.session:
+                continue
 
-        if self.is_loading or self.running:
-            self.app.root.after(20, self.process_results)
+            elif result['type'] == 'data_update':
+                # Also after Stop: the worker flushes its last rows when it pauses
+                counts = result['counts']
+                new_rows.extend(result['new_rows'])
+
+            elif not self.running:
+                continue
+
+            elif result['type'] == 'detections':
+                latest.append(result)
+                self.worker_dropped = result['dropped']
+
+        self._store_rows(counts, new_rows)
+
+        # Newest frame that still has a preview wins, the rest are only counted
+        for detections in reversed(latest):
+            if self.show_detections(detections):
+                break
+        self.results_coalesced += max(0, len(latest) - 1)
+
+        if self.worker_alive():
+            self.results_job = self.app.root.after(RESULT_QUEUE_TIMEOUT, self.process_results)
+        else:
+            self.results_job = None
+
+    def show_detections(self, detections):
+        """Draw the detection overlays on the matching preview frame and show it"""
+        with self.preview_lock:
+            if detections['seq'] not in self.preview_frames:
+                # No preview was taken for this frame
+                return False
+            # Earlier frames will never be shown now, discard them
+            while True:
+                seq, img = self.preview_frames.popitem(last=False)
+                if seq == detections['seq']:
+                    break
+
+        draw_overlays(img, detections, self.app.settings.get('overlay_level', "full"), self.class_names)
+        imgtk = ImageTk.PhotoImage(Image.fromarray(img))
+        self.app.ui_components.video_label.imgtk = imgtk
+        self.app.ui_components.video_label.configure(image=imgtk)
+        startup_profile.mark("first detection frame shown")
+
+        # Only update trackbar for video files
+        if (self.app.video_handler.cap and 
+            self.app.video_handler.is_video_file and 
+            not self.app.video_handler.is_webcam):
+            current_frame = int(self.app.video_handler.cap.get(cv2.CAP_PROP_POS_FRAMES))
+            if not self.app.video_handler.is_seeking:
+                self.app.ui_components.trackbar_var.set(current_frame)
+
+            total_sec = self.app.video_handler.total_frames / self.app.video_handler.video_fps
+            current_sec = current_frame / self.app.video_handler.video_fps
+            self.app.ui_components.time_label.config(
+                text=f"{format_time(current_sec)} / {format_time(total_sec)}"
+            )
+        return True
 
     def cleanup(self):
         """Cleanup detection resources"""
         if self.animation_job:
             self.app.root.after_cancel(self.animation_job)
+        if self.results_job:
+            self.app.root.after_cancel(self.results_job)
+            self.results_job = None
 
-        # Terminate detection process if still running
-        if self.detection_proc and self.detection_proc.is_alive():
-            print("[CLEANUP] Terminating detection process.")
-            self.detection_proc.terminate()
-            self.detection_proc.join()
-
-        # Set stop event
+        # Ask the worker to finish, terminate it if it does not
         self.stop_event.set()
+        if self.worker_alive():
+            self.control_q.put({"type": "shutdown"})
+            self.detection_proc.join(timeout=2.0)
+            if self.detection_proc.is_alive():
+                print("[CLEANUP] Terminating detection process.")
+                self.detection_proc.terminate()
+                self.detection_proc.join()
+        self.detection_proc = None
+
+        self._close_rings((self.frame_ring,))
+        self.frame_ring = None
 
         # Clear queues
-        for q in [self.result_q, self.frame_q]:
+        for q in [self.result_q, self.frame_q, self.control_q]:
             while not q.empty():
                 try:
                     q.get_nowait()
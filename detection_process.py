@@ -1,14 +1,17 @@
 # core/detection_process.py
-import cv2
-from ultralytics import YOLO
 import os
 import sys
+import time
+import numpy as np
 from multiprocessing import Queue, Event
-from queue import Empty
+from queue import Empty, Full
 from datetime import datetime, timedelta
 
-MAX_DISPLAY_WIDTH = 960
-MAX_DISPLAY_HEIGHT = 720
+from .counter import VehicleCounter, resolve_start_time, compute_line_positions, extract_tracks
+from .motion_gate import MotionGate
+from .roi import RoiSelector
+from .letterbox import InferenceResizer, DEFAULT_IMGSZ
+from .model_loader import load_model, reset_tracker
 
 def resource_path(relative_path):
     try:
@@ -17,42 +20,211 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
-def detection_process(frame_q: Queue, result_q: Queue, stop_event: Event, initial_settings: dict):
+def _detections_message(session, seq, frame_shape, line1_pos, line2_pos, orientation, roi,
+                        track_ids, class_ids, boxes):
+    """Compact per-frame metadata the GUI draws its overlays from"""
+    return {
+        "type": "detections",
+        "session": session,
+        "seq": seq,
+        "shape": tuple(frame_shape[:2]),
+        "lines": (line1_pos, line2_pos),
+        "orientation": orientation,
+        "roi": (roi.x0, roi.y0, roi.x1, roi.y1) if roi else None,
+        "boxes": np.asarray(boxes, dtype=np.float32).reshape(-1, 4),
+        "ids": np.asarray(track_ids, dtype=np.int32),
+        "classes": np.asarray(class_ids, dtype=np.int16),
+    }
+
+
+class ResultSender:
+    """Writes to the bounded result queue without ever blocking the worker.
+
+    Detection metadata is only for display and is dropped (and counted)
+    when the GUI falls behind; counted rows are held back and sent with
+    the next update instead. Before a pause or reset takes effect the
+    worker calls flush(), which waits for room, so no vehicle is lost.
+    """
+
+    def __init__(self, result_q):
+        self.result_q = result_q
+        self.dropped = 0
+        self.pending_rows = []
+
+    def reset(self):
+        if self.dropped:
+            print(f"[INFO] Result channel dropped {self.dropped} preview messages")
+        self.dropped = 0
+        self.pending_rows = []
+
+    def send_detections(self, message):
+        message["dropped"] = self.dropped
+        try:
+            self.result_q.put_nowait(message)
+        except Full:
+            self.dropped += 1
+
+    def _rows_message(self, session, counter):
+        return {
+            "type": "data_update",
+            "session": session,
+            "counts": counter.counts_snapshot(),
+            "new_rows": self.pending_rows
+        }
+
+    def send_rows(self, session, counter, new_rows):
+        self.pending_rows.extend(new_rows)
+        if not self.pending_rows:
+            return
+        try:
+            self.result_q.put_nowait(self._rows_message(session, counter))
+            self.pending_rows = []
+        except Full:
+            pass  # retried with the next frame
+
+    def flush(self, session, counter):
+        """Send the rows still held back, blocking until the GUI makes room"""
+        if counter is None or not self.pending_rows:
+            return
+        self.result_q.put(self._rows_message(session, counter))
+        self.pending_rows = []
+
+
+def _release_unused(frame, frame_ring, session, ring_session):
+    """Hand back the slot of a frame that will not be processed.
+
+    Returns False for a frame of a newer session: its new_source or reset
+    command is still in control_q, and its slot may belong to a ring this
+    worker has not been given yet, so it has to wait for that command.
+    """
+    frame_session, frame_ring_session, _, slot, _, _ = frame
+    if frame_session > session or frame_ring_session > ring_session:
+        return False
+    if frame_ring is not None and frame_ring_session == ring_session:
+        frame_ring.release(slot)
+    return True
+
+
+def _geometry_key(settings):
+    """Settings that decide what the tracker sees: inference size and region of interest"""
+    return (settings.get('inference_imgsz', DEFAULT_IMGSZ),
+            tuple(settings.get(name) for name in RoiSelector.KEYS),
+            tuple(tuple(point) for point in settings.get('roi_polygon') or []))
+
+
+def _report_gate(gate, inference_time, inferred_frames):
+    if gate is not None:
+        print(f"[INFO] {gate.summary(inference_time / inferred_frames if inferred_frames else 0.0)}")
+
+
+def detection_process(control_q: Queue, frame_q: Queue, result_q: Queue, stop_event: Event,
+                      initial_settings: dict):
+    """Long-lived worker: the model stays loaded across detection sessions.
+
+    The GUI drives it through control_q with dict commands:
+    new_source (frame ring for a new video size), reset (fresh
+    counter and tracker), pause, resume and shutdown. Every session has a
+    number; frames and results from an older session are dropped. The
+    inference size and region of interest are fixed for a session: the
+    persisted ByteTrack tracker works in resized-crop coordinates, so
+    changing them mid-run would lose every live track. Every
+    frame also names the ring it was written to (by the session that
+    created it), so its slot is only ever released on that ring. Only
+    detection metadata goes back, the GUI draws its own preview.
+    """
     print(f"Detection process started with PID: {os.getpid()}")
 
+    settings = initial_settings
+
     try:
-        model = YOLO(resource_path('models/best1.pt'))
-        result_q.put({"type": "model_ready"})
+        model = load_model(resource_path('models/best1.pt'), settings)
+        result_q.put({"type": "model_ready", "names": dict(model.names)})
     except Exception as e:
         result_q.put({"type": "model_error", "error": str(e)})
         return
 
-    settings = initial_settings
-    vehicle_states = {}
-    golongan_list = ["Gol 1", "Gol 2", "Gol 3", "Gol 4", "Gol 5", "Motor"]
-    vehicle_counts = {golongan: {"In": 0, "Out": 0} for golongan in golongan_list}
-
-    frame_num = 0
-    pending_detections = []
+    frame_ring = None
+    ring_session = -1  # first session using the current rings
+    session = -1
+    paused = True
+    counter = gate = roi_selector = resizer = None
+    session_settings = settings  # inference size and ROI of the running session
+    deferred = None  # frame that arrived ahead of its session's control command
+    sender = ResultSender(result_q)
+    inference_time = 0.0
+    inferred_frames = 0
 
-    # --- Inisialisasi Time Offset ---
-    if "start_timestamp_user" in settings and settings["start_timestamp_user"]:
+    while not stop_event.is_set():
+        # Commands are applied before the next frame is taken
         try:
-            start_time = datetime.strptime(settings["start_timestamp_user"], "%Y-%m-%d %H:%M:%S")
-            print(f"[INFO] Using custom start timestamp: {start_time}")
-        except ValueError:
-            print(f"[WARNING] Invalid start_timestamp_user: {settings['start_timestamp_user']}")
-            start_time = datetime.now()
-    else:
-        start_time = datetime.now()
+            while True:
+                command = control_q.get_nowait()
+                if command['type'] in ('new_source', 'reset'):
+                    sender.flush(session, counter)
+                    _report_gate(gate, inference_time, inferred_frames)
+                    if command['type'] == 'new_source':
+                        if frame_ring is not None:
+                            frame_ring.close()
+                        frame_ring = command['frame_ring']
+                        ring_session = command['session']
+                    session = command['session']
+                    settings = session_settings = command['settings']
+                    # --- Inisialisasi Time Offset ---
+                    counter = VehicleCounter(model.names, resolve_start_time(settings))
+                    sender.reset()
+                    gate = MotionGate.from_settings(settings)
+                    roi_selector = RoiSelector()
+                    resizer = InferenceResizer(settings.get('inference_imgsz', DEFAULT_IMGSZ))
+                    reset_tracker(model)
+                    inference_time = 0.0
+                    inferred_frames = 0
+                elif command['type'] == 'pause':
+                    sender.flush(session, counter)
+                    paused = True
+                elif command['type'] == 'resume':
+                    paused = False
+                elif command['type'] == 'shutdown':
+                    stop_event.set()
+        except Empty:
+            pass
+        if stop_event.is_set():
+            break
+
+        if paused or frame_ring is None:
+            # Hand back slots of frames that arrive while nothing is running
+            if deferred is not None and _release_unused(deferred, frame_ring, session, ring_session):
+                deferred = None
+            try:
+                while deferred is None:
+                    data = frame_q.get_nowait()
+                    if not _release_unused(data, frame_ring, session, ring_session):
+                        deferred = data
+            except Empty:
+                pass
+            time.sleep(0.02)
+            continue
 
-    while not stop_event.is_set():
         try:
-            data = frame_q.get(timeout=0.05) # Mengurangi timeout untuk responsifitas lebih baik
+            if deferred is not None:
+                data, deferred = deferred, None
+            else:
+                data = frame_q.get(timeout=0.05) # Mengurangi timeout untuk responsifitas lebih baik
 
-            frame, new_settings = data
+            frame_session, _, seq, slot, frame_shape, new_settings = data
+            if frame_session != session:
+                if not _release_unused(data, frame_ring, session, ring_session):
+                    # Kept until the control command for its session has been applied
+                    deferred = data
+                    time.sleep(0.005)
+                continue
 
             if new_settings:
+                # Keep the gate's background model and statistics unless its own settings changed
+                if MotionGate.settings_key(new_settings) != MotionGate.settings_key(settings):
+                    _report_gate(gate, inference_time, inferred_frames)
+                    gate = MotionGate.from_settings(new_settings)
+                if _geometry_key(new_settings) != _geometry_key(settings):
+                    print("[INFO] Inference size and region of interest changes apply from the next start")
                 settings = new_settings
                 # --- Perbarui Time Offset jika Pengaturan Berubah ---
                 if "start_timestamp_user" in settings and settings["start_timestamp_user"]:
@@ -69,83 +241,51 @@ def detection_process(frame_q: Queue, result_q: Queue, stop_event: Event, initia
                     time_offset = timedelta(seconds=0) # Jika timestamp dihapus, reset offset
                 # --- Akhir Perbarui Time Offset ---
 
-            (h_orig, w_orig) = frame.shape[:2]
-
-            line_offset_scaled = int(settings['line_offset'] * (h_orig / MAX_DISPLAY_HEIGHT))
-            if settings['line_orientation'] == "Horizontal":
-                line1_pos = int(settings['line1_y'] * (h_orig / MAX_DISPLAY_HEIGHT))
-                line2_pos = line1_pos + line_offset_scaled
-                # Gambar garis deteksi pada frame
-                cv2.line(frame, (0, line1_pos), (w_orig, line1_pos), (0, 255, 0), 2)
-                cv2.line(frame, (0, line2_pos), (w_orig, line2_pos), (0, 0, 255), 2)
-            else: # Vertical
-                line1_pos = int(settings['line1_x'] * (w_orig / MAX_DISPLAY_WIDTH))
-                line2_pos = line1_pos + line_offset_scaled
-                # Gambar garis deteksi pada frame
-                cv2.line(frame, (line1_pos, 0), (line1_pos, h_orig), (0, 255, 0), 2)
-                cv2.line(frame, (line2_pos, 0), (line2_pos, h_orig), (0, 0, 255), 2)
-
-            results = model.track(frame, persist=True, tracker="bytetrack.yaml", conf=settings['confidence_threshold'], verbose=False)
-            annotated_frame = results[0].plot()
-
-            if results[0].boxes.id is not None:
-                track_ids = results[0].boxes.id.int().cpu().tolist()
-                class_ids = results[0].boxes.cls.int().cpu().tolist()
-                boxes = results[0].boxes.xyxy.cpu()
-
-                for i, track_id in enumerate(track_ids):
-                    if track_id in vehicle_states:
-                        vehicle_states[track_id]['last_seen'] = frame_num
-
-                    if track_id in vehicle_states and not vehicle_states[track_id]['counted']:
-                        initial_line = vehicle_states[track_id]['line']
-                        direction_confirmed, direction = False, ""
-                        vehicle_golongan = vehicle_states[track_id]['golongan']
-                        trigger_point = int(boxes[i][3]) if settings['line_orientation'] == "Horizontal" else int((boxes[i][0] + boxes[i][2]) / 2)
-
-                        if initial_line == 1 and abs(trigger_point - line2_pos) < 25:
-                            if vehicle_golongan != "Unknown": vehicle_counts[vehicle_golongan]["In"] += 1
-                            direction, direction_confirmed = "In", True
-                        elif initial_line == 2 and abs(trigger_point - line1_pos) < 25:
-                            if vehicle_golongan != "Unknown": vehicle_counts[vehicle_golongan]["Out"] += 1
-                            direction, direction_confirmed = "Out", True
-
-                        if direction_confirmed:
-                            vehicle_states[track_id]['counted'] = True
-                            # --- Terapkan Time Offset pada Timestamp Deteksi ---
-                            timestamp = (start_time + timedelta(seconds=frame_num / 30)).strftime("%Y-%m-%d %H:%M:%S")
-                            # --- Akhir Penerapan Time Offset ---
-                            new_row = {"Timestamp": timestamp, "Vehicle ID": track_id, "Class": vehicle_golongan, "Direction": direction}
-                            pending_detections.append(new_row)
-
-                    elif track_id not in vehicle_states:
-                        yolo_class_name = model.names[class_ids[i]]
-                        golongan = yolo_class_name if yolo_class_name in vehicle_counts else "Unknown"
-                        trigger_point = int(boxes[i][3]) if settings['line_orientation'] == "Horizontal" else int((boxes[i][0] + boxes[i][2]) / 2)
-
-                        if abs(trigger_point - line1_pos) < 25:
-                            vehicle_states[track_id] = {'line': 1, 'golongan': golongan, 'counted': False, 'last_seen': frame_num}
-                        elif abs(trigger_point - line2_pos) < 25:
-                            vehicle_states[track_id] = {'line': 2, 'golongan': golongan, 'counted': False, 'last_seen': frame_num}
-
-            inactive_tracks = [tid for tid, data in vehicle_states.items() if frame_num - data.get('last_seen', frame_num) > 30]
-            for tid in inactive_tracks:
-                del vehicle_states[tid]
-
-            result_q.put({"type": "frame", "image": annotated_frame})
-
-            if pending_detections:
-                result_q.put({
-                    "type": "data_update",
-                    "counts": vehicle_counts.copy(),
-                    "new_rows": list(pending_detections)
-                })
-                pending_detections.clear()
-
-            frame_num += 1
+            # Frame dibaca langsung dari shared memory, slot dikembalikan setelah inferensi
+            try:
+                frame = frame_ring.view(slot, frame_shape)
+                line1_pos, line2_pos = compute_line_positions(settings, frame.shape)
+                # Crop from the session's own settings, so the tracker's coordinates never jump
+                roi = roi_selector.get(session_settings, frame.shape,
+                                       *compute_line_positions(session_settings, frame.shape))
+                run_inference = gate is None or gate.needs_inference(frame, line1_pos, line2_pos,
+                                                                     settings['line_orientation'])
+
+                if run_inference:
+                    inference_start = time.perf_counter()
+                    source = resizer.prepare(roi.crop(frame) if roi else frame)
+                    results = model.track(source, persist=True, tracker="bytetrack.yaml", conf=settings['confidence_threshold'], imgsz=resizer.imgsz, verbose=False)
+                    inference_time += time.perf_counter() - inference_start
+                    inferred_frames += 1
+            finally:
+                frame_ring.release(slot)
+
+            if run_inference:
+                track_ids, class_ids, boxes = extract_tracks(results[0])
+                if len(boxes):
+                    boxes = resizer.to_source(boxes)
+                    if roi:
+                        boxes = roi.to_frame(boxes)
+                new_rows = counter.update(track_ids, class_ids, boxes, line1_pos, line2_pos,
+                                          settings['line_orientation'])
+            else:
+                # Tracker untouched, only the frame clock moves on
+                track_ids, class_ids, boxes = [], [], []
+                counter.advance()
+                new_rows = []
+
+            sender.send_rows(session, counter, new_rows)
+            sender.send_detections(_detections_message(session, seq, frame_shape, line1_pos, line2_pos,
+                                                       settings['line_orientation'], roi,
+                                                       track_ids, class_ids, boxes))
         except Empty:
             continue
         except Exception as e:
+            # One bad frame must not take the resident model down with it
             print(f"Error in detection process: {e}")
-            break
+            continue
+    _report_gate(gate, inference_time, inferred_frames)
+    sender.reset()
+    if frame_ring is not None:
+        frame_ring.close()
     print("Detection process received stop signal and is finishing.")
\ No newline at end of file
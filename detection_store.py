@@ -0,0 +1,112 @@
+# core/detection_store.py
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from .counter import GOLONGAN_LIST, DIRECTIONS
+
+DETECTION_COLUMNS = ["Timestamp", "Vehicle ID", "Class", "Direction"]
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+CHUNK_ROWS = 4096
+EPOCH = datetime(1970, 1, 1)
+
+ROW_DTYPE = np.dtype([("timestamp", "i8"), ("vehicle_id", "i8"), ("cls", "i1"), ("direction", "i1")])
+
+
+class DetectionStore:
+    """Append-only detection log kept as fixed-size typed chunks.
+
+    Timestamps are stored as naive epoch seconds and class/direction as
+    small integer codes, so appending never copies earlier rows and a
+    day of traffic stays a few MB. A DataFrame is only built on request
+    (export, queries) and cached until the next append.
+    """
+
+    def __init__(self, chunk_rows=CHUNK_ROWS):
+        self.chunk_rows = chunk_rows
+        self.classes = list(GOLONGAN_LIST) + ["Unknown"]
+        self.directions = list(DIRECTIONS)
+        self.clear()
+
+    def clear(self):
+        self._chunks = []
+        self._fill = self.chunk_rows  # forces a new chunk on the first append
+        self._length = 0
+        self._frame = None
+        self._last_timestamp = (None, 0)
+
+    def __len__(self):
+        return self._length
+
+    def _code(self, categories, value):
+        try:
+            return categories.index(value)
+        except ValueError:
+            categories.append(value)
+            return len(categories) - 1
+
+    def _seconds(self, timestamp):
+        # Rows of one frame share a timestamp string, parse it once
+        if self._last_timestamp[0] != timestamp:
+            parsed = datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+            self._last_timestamp = (timestamp, int((parsed - EPOCH).total_seconds()))
+        return self._last_timestamp[1]
+
+    def append_rows(self, rows):
+        """Append counter rows (dicts with the DETECTION_COLUMNS keys)"""
+        for row in rows:
+            if self._fill == self.chunk_rows:
+                self._chunks.append(np.zeros(self.chunk_rows, dtype=ROW_DTYPE))
+                self._fill = 0
+            self._chunks[-1][self._fill] = (
+                self._seconds(row["Timestamp"]),
+                row["Vehicle ID"],
+                self._code(self.classes, row["Class"]),
+                self._code(self.directions, row["Direction"]),
+            )
+            self._fill += 1
+            self._length += 1
+        if rows:
+            self._frame = None
+
+    def records(self, start=0, stop=None):
+        """Structured array of rows [start, stop)"""
+        stop = self._length if stop is None else min(stop, self._length)
+        if stop <= start:
+            return np.zeros(0, dtype=ROW_DTYPE)
+        first, last = start // self.chunk_rows, (stop - 1) // self.chunk_rows
+        parts = [self._chunks[i] for i in range(first, last + 1)]
+        data = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        offset = first * self.chunk_rows
+        return data[start - offset:stop - offset]
+
+    def rows(self, start, stop):
+        """Rows [start, stop) as display tuples"""
+        return [
+            ((EPOCH + timedelta(seconds=int(r["timestamp"]))).strftime(TIMESTAMP_FORMAT),
+             int(r["vehicle_id"]), self.classes[r["cls"]], self.directions[r["direction"]])
+            for r in self.records(start, stop)
+        ]
+
+    def to_frame(self, stop=None):
+        """Rows [0, stop) (default: all) as a DataFrame with the classic column layout.
+
+        Only the whole log is cached. Earlier rows never change, so a prefix
+        can be built in another thread while rows keep being appended.
+        """
+        if stop is not None:
+            return self._build_frame(self.records(0, stop))
+        if self._frame is None:
+            self._frame = self._build_frame(self.records())
+        return self._frame
+
+    def _build_frame(self, data):
+        import pandas as pd
+
+        timestamps = pd.to_datetime(data["timestamp"], unit="s").strftime(TIMESTAMP_FORMAT)
+        return pd.DataFrame({
+            "Timestamp": np.asarray(timestamps, dtype=object),
+            "Vehicle ID": data["vehicle_id"],
+            "Class": np.asarray(self.classes, dtype=object)[data["cls"]],
+            "Direction": np.asarray(self.directions, dtype=object)[data["direction"]],
+        }, columns=DETECTION_COLUMNS)
\ No newline at end of file
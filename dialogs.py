@@ -190,4 +190,32 @@ class TimeDialog(Toplevel):
             self.apply_callback(result_dt.strftime("%Y-%m-%d %H:%M:%S"))
             self.destroy()
         except Exception as e:
-            messagebox.showerror("Error", f"Invalid input: {e}")
\ No newline at end of file
+            messagebox.showerror("Error", f"Invalid input: {e}")
+
+class ExportProgressDialog(Toplevel):
+    def __init__(self, parent, file_path):
+        super().__init__(parent)
+        self.title("Exporting Data")
+        self.transient(parent)
+        # Closing is disabled, the window goes away when the export finishes
+        self.protocol("WM_DELETE_WINDOW", lambda: None)
+
+        screen_width = parent.winfo_screenwidth()
+        screen_height = parent.winfo_screenheight()
+        DEFAULT_DIALOG_HEIGHT = 120
+        pos_x = (screen_width - DEFAULT_DIALOG_WIDTH) // 2
+        pos_y = (screen_height - DEFAULT_DIALOG_HEIGHT) // 2
+        self.geometry(f"{DEFAULT_DIALOG_WIDTH}x{DEFAULT_DIALOG_HEIGHT}+{pos_x}+{pos_y}")
+
+        frame = Frame(self, padding=15)
+        frame.pack(fill="both", expand=True)
+
+        Label(frame, text=f"Saving to {file_path}", wraplength=DEFAULT_DIALOG_WIDTH - 30).pack(anchor="w")
+        self.progress = ttk.Progressbar(frame, mode="determinate", maximum=100, bootstyle="info-striped")
+        self.progress.pack(fill="x", pady=(10, 5))
+        self.stage_label = Label(frame, text="Preparing...")
+        self.stage_label.pack(anchor="w")
+
+    def set_progress(self, done, total, stage):
+        self.progress["value"] = 100.0 * done / total if total else 0
+        self.stage_label.config(text=f"{stage} ({done:,}/{total:,} rows)")
\ No newline at end of file
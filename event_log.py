@@ -0,0 +1,128 @@
+# core/event_log.py
+import os
+import json
+import time
+import sqlite3
+from datetime import datetime
+
+EVENT_LOG_PATH = os.path.join("data", "detections.sqlite3")
+COMMIT_ROWS = 50        # commit once this many events are pending...
+COMMIT_INTERVAL = 1.0   # ...or once the oldest pending event is this many seconds old
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT,
+    started TEXT NOT NULL,
+    ended TEXT,
+    settings TEXT
+);
+CREATE TABLE IF NOT EXISTS events (
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    timestamp TEXT NOT NULL,
+    vehicle_id INTEGER NOT NULL,
+    class TEXT NOT NULL,
+    direction TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_session ON events(session_id);
+"""
+
+
+class EventLog:
+    """Durable SQLite (WAL) log of count events, committed in small batches.
+
+    A session is open from its first event until end_session(); a session
+    still open at startup means the app did not shut down cleanly and
+    its events can be recovered.
+    """
+
+    def __init__(self, path=EVENT_LOG_PATH, commit_rows=COMMIT_ROWS, commit_interval=COMMIT_INTERVAL):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.commit_rows = commit_rows
+        self.commit_interval = commit_interval
+        self.session_id = None
+        self.pending = 0
+        self._oldest_pending = None
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL survives application crashes; only an OS crash can lose the last commit
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def begin_session(self, source=None, settings=None):
+        self.end_session()
+        cur = self.conn.execute(
+            "INSERT INTO sessions (source, started, settings) VALUES (?, ?, ?)",
+            (None if source is None else str(source), datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+             json.dumps(settings, default=str) if settings else None))
+        self.conn.commit()
+        self.session_id = cur.lastrowid
+        return self.session_id
+
+    def append(self, rows, source=None, settings=None):
+        """Log counter rows; returns True while some of them are not committed yet"""
+        if not rows:
+            return self.pending > 0
+        if self.session_id is None:
+            self.begin_session(source, settings)
+        self.conn.executemany(
+            "INSERT INTO events (session_id, timestamp, vehicle_id, class, direction) VALUES (?, ?, ?, ?, ?)",
+            [(self.session_id, row["Timestamp"], int(row["Vehicle ID"]), row["Class"], row["Direction"])
+             for row in rows])
+        self.pending += len(rows)
+        if self._oldest_pending is None:
+            self._oldest_pending = time.monotonic()
+        return not self.commit_if_due()
+
+    def commit_if_due(self):
+        """Commit when the batch is full or old enough; True if nothing is pending afterwards"""
+        if self.pending and (self.pending >= self.commit_rows or
+                             time.monotonic() - self._oldest_pending >= self.commit_interval):
+            self.flush()
+        return self.pending == 0
+
+    def flush(self):
+        self.conn.commit()
+        self.pending = 0
+        self._oldest_pending = None
+
+    def end_session(self):
+        """Close the current session so it is not offered for recovery"""
+        if self.session_id is not None:
+            self.conn.execute("UPDATE sessions SET ended = ? WHERE id = ?",
+                              (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), self.session_id))
+            self.session_id = None
+        self.flush()
+
+    def unfinished_session(self):
+        """(id, source, started, event count) of the newest session left open, or None"""
+        return self.conn.execute(
+            "SELECT s.id, s.source, s.started, COUNT(e.session_id) FROM sessions s "
+            "JOIN events e ON e.session_id = s.id WHERE s.ended IS NULL "
+            "GROUP BY s.id ORDER BY s.id DESC LIMIT 1").fetchone()
+
+    def load_session(self, session_id):
+        """Events of a session as counter rows"""
+        cur = self.conn.execute(
+            "SELECT timestamp, vehicle_id, class, direction FROM events WHERE session_id = ? ORDER BY rowid",
+            (session_id,))
+        return [{"Timestamp": t, "Vehicle ID": v, "Class": c, "Direction": d} for t, v, c, d in cur]
+
+    def resume_session(self, session_id):
+        """Continue logging into a recovered session"""
+        self.end_session()
+        self.close_unfinished(keep=session_id)
+        self.session_id = session_id
+
+    def close_unfinished(self, keep=None):
+        """Mark sessions left open by an earlier run (except `keep`) as ended"""
+        self.conn.execute("UPDATE sessions SET ended = started WHERE ended IS NULL AND id IS NOT ?", (keep,))
+        self.conn.commit()
+
+    def close(self):
+        self.end_session()
+        self.conn.close()
\ No newline at end of file
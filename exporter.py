@@ -3,14 +3,30 @@ import os
 import io
 import pandas as pd
 from tkinter import messagebox, filedialog
-import matplotlib.pyplot as plt
+from openpyxl import Workbook
 from openpyxl.drawing.image import Image as OpenpyxlImage
 
-def save_to_excel(df, settings, vehicle_counts):
-    if df.empty:
-        messagebox.showinfo("Info", "No data to save.")
-        return
+EXCEL_MAX_ROWS = 1048576
+EXPORT_CHUNK_ROWS = 100000  # rows per chunk for Parquet/CSV streaming
+TABLE_FORMATS = {".parquet": "Parquet", ".csv": "CSV"}
+RAW_SHEET_ROWS = EXCEL_MAX_ROWS - 1  # one header row per sheet
+PROGRESS_EVERY = 5000  # rows between progress callbacks
 
+
+def ask_table_path():
+    """Ask where to save a Parquet or CSV export; None if cancelled"""
+    os.makedirs("data", exist_ok=True)
+
+    file_path = filedialog.asksaveasfilename(
+        defaultextension=".parquet",
+        filetypes=[("Parquet files", "*.parquet"), ("CSV files", "*.csv")],
+        title="Export Detection Table"
+    )
+    return file_path or None
+
+
+def ask_excel_path():
+    """Ask where to save the export; None if cancelled"""
     output_dir = "data"
     os.makedirs(output_dir, exist_ok=True)
 
@@ -19,70 +35,205 @@ def save_to_excel(df, settings, vehicle_counts):
         filetypes=[("Excel files", "*.xlsx")],
         title="Save Detection Data"
     )
+    return file_path or None
+
+
+def period_pivots(df, settings):
+    """Hourly, daily and monthly counts per class as (sheet name, DataFrame)"""
+    start_time = pd.to_datetime(settings.get("start_timestamp_user") or df['Timestamp'].iloc[0])
+    df_copy = df.copy()
+    df_copy['Timestamp'] = pd.to_datetime(df_copy['Timestamp'])
+
+    # Hourly
+    df_copy['hour'] = ((df_copy['Timestamp'] - start_time).dt.total_seconds() // 3600).astype(int)
+    df_copy['hour_str'] = df_copy['hour'].apply(lambda x: (start_time + pd.Timedelta(hours=x)).strftime("%Y-%B-%d %H:00:00"))
+    hourly = df_copy.groupby(['hour_str', 'Class']).size().reset_index(name='Overall')
+    hourly_pivot = hourly.pivot_table(index='hour_str', columns='Class', values='Overall', fill_value=0).reset_index()
+    hourly_pivot.rename(columns={'hour_str': 'Time'}, inplace=True)
+
+    # Daily
+    df_copy['day_str'] = df_copy['Timestamp'].dt.strftime("%Y-%m-%d \n %A")
+    daily = df_copy.groupby(['day_str', 'Class']).size().reset_index(name='Overall')
+    daily_pivot = daily.pivot_table(index='day_str', columns='Class', values='Overall', fill_value=0).reset_index()
+    daily_pivot.rename(columns={'day_str': 'Date'}, inplace=True)
+
+    # Monthly
+    df_copy['mon_str'] = df_copy['Timestamp'].dt.strftime("%B-%Y")
+    monthly = df_copy.groupby(['mon_str', 'Class']).size().reset_index(name='Overall')
+    monthly_pivot = monthly.pivot_table(index='mon_str', columns='Class', values='Overall', fill_value=0).reset_index()
+    monthly_pivot.rename(columns={'mon_str': 'Date'}, inplace=True)
+
+    return [('Hourly Data', hourly_pivot), ('Daily Data', daily_pivot), ('Monthly Data', monthly_pivot)]
+
+
+def summary_chart(vehicle_counts):
+    """PNG bar chart of In/Out counts per golongan"""
+    # Figure + Agg instead of pyplot so this is safe off the Tk thread
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=(10, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    summary_data = []
+    for golongan, counts in vehicle_counts.items():
+        summary_data.append([golongan, counts["In"], counts["Out"]])
+    summary_df = pd.DataFrame(summary_data, columns=["Golongan", "Total In", "Total Out"])
+    summary_df.set_index("Golongan")[["Total In", "Total Out"]].plot(kind='bar', ax=ax)
+
+    ax.set_title('Vehicle In/Out Counts by Golongan')
+    ax.set_ylabel('Count')
+    ax.set_xlabel('Class')
+    for label in ax.get_xticklabels():
+        label.set_rotation(45)
+        label.set_horizontalalignment('right')
+    fig.tight_layout()
+
+    img_buf = io.BytesIO()
+    fig.savefig(img_buf, format='png', bbox_inches='tight')
+    img_buf.seek(0)
+    return img_buf
+
+
+def write_excel(file_path, df, settings, vehicle_counts, progress=None, pivots=None):
+    """Stream the export with openpyxl's write-only mode; no Tk calls, safe in a thread.
+
+    Raw rows beyond Excel's sheet limit continue on 'Summary (2)', 'Summary (3)', ...
+    progress(done, total, stage) is called every PROGRESS_EVERY rows. Pre-aggregated
+    `pivots` (see Rollups.pivots) skip recomputing them from the raw rows.
+    """
+    if pivots is None:
+        pivots = period_pivots(df, settings)
+    total = len(df) + sum(len(table) for _, table in pivots)
+    done = 0
+
+    def report(stage):
+        if progress:
+            progress(done, total, stage)
+
+    wb = Workbook(write_only=True)
 
+    # Summary (raw detections)
+    columns = list(df.columns)
+    for part, start in enumerate(range(0, max(len(df), 1), RAW_SHEET_ROWS)):
+        ws = wb.create_sheet('Summary' if part == 0 else f'Summary ({part + 1})')
+        ws.append(columns)
+        for row in df.iloc[start:start + RAW_SHEET_ROWS].itertuples(index=False, name=None):
+            ws.append(row)
+            done += 1
+            if done % PROGRESS_EVERY == 0:
+                report("Raw data")
+
+    for sheet_name, table in pivots:
+        report(sheet_name)
+        ws = wb.create_sheet(sheet_name)
+        ws.append([str(column) for column in table.columns])
+        for row in table.itertuples(index=False, name=None):
+            ws.append(row)
+        done += len(table)
+
+    report("Summary Chart")
+    img_sheet = wb.create_sheet('Summary Chart')
+    img_openpyxl = OpenpyxlImage(summary_chart(vehicle_counts))
+    img_openpyxl.anchor = 'A1'
+    img_sheet.add_image(img_openpyxl)
+
+    report("Saving")
+    wb.save(file_path)
+    report("Done")
+
+
+def detection_chunks(store, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Typed DataFrame chunks straight from a DetectionStore, as (chunk, rows done, total).
+
+    Only one chunk exists at a time, so the table is never copied whole.
+    Rows appended while exporting are not included.
+    """
+    total = len(store)
+    classes = list(store.classes)
+    directions = list(store.directions)
+    for start in range(0, max(total, 1), chunk_rows):
+        data = store.records(start, min(total, start + chunk_rows))
+        chunk = pd.DataFrame({
+            "Timestamp": data["timestamp"].astype("datetime64[s]"),
+            "Vehicle ID": data["vehicle_id"],
+            "Class": pd.Categorical.from_codes(data["cls"], categories=classes),
+            "Direction": pd.Categorical.from_codes(data["direction"], categories=directions),
+        })
+        yield chunk, start + len(data), total
+
+
+def write_parquet(file_path, store, progress=None):
+    """Detection table as zstd Parquet, written one row group per chunk"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow), or save as .csv")
+
+    writer = None
+    try:
+        for chunk, done, total in detection_chunks(store):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(file_path, table.schema, compression="zstd")
+            writer.write_table(table)
+            if progress:
+                progress(done, total, "Detections")
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_csv(file_path, store, progress=None):
+    """Detection table as CSV, appended chunk by chunk"""
+    for part, (chunk, done, total) in enumerate(detection_chunks(store)):
+        first = part == 0
+        chunk.to_csv(file_path, mode="w" if first else "a", header=first, index=False,
+                     date_format="%Y-%m-%d %H:%M:%S")
+        if progress:
+            progress(done, total, "Detections")
+
+
+def export_table(file_path, store, pivots=None, progress=None):
+    """Write the detections (and the rollup pivots next to them) as Parquet or CSV.
+
+    Rollups go to <name>_hourly, <name>_daily and <name>_monthly with the
+    same extension. Returns the written paths.
+    """
+    stem, ext = os.path.splitext(file_path)
+    ext = ext.lower()
+    if ext not in TABLE_FORMATS:
+        raise ValueError(f"Unsupported export format: {ext or 'none'} (use .parquet or .csv)")
+
+    if ext == ".parquet":
+        write_parquet(file_path, store, progress)
+    else:
+        write_csv(file_path, store, progress)
+    written = [file_path]
+
+    for sheet_name, table in pivots or []:
+        path = f"{stem}_{sheet_name.split()[0].lower()}{ext}"
+        if ext == ".parquet":
+            table.to_parquet(path, index=False, compression="zstd")
+        else:
+            table.to_csv(path, index=False)
+        written.append(path)
+    return written
+
+
+def save_to_excel(df, settings, vehicle_counts):
+    if df.empty:
+        messagebox.showinfo("Info", "No data to save.")
+        return
+
+    file_path = ask_excel_path()
     if not file_path:
         return
 
     try:
-        with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-            # Summary
-            df.to_excel(writer, sheet_name='Summary', index=False)
-
-            start_time = pd.to_datetime(settings.get("start_timestamp_user") or df['Timestamp'].iloc[0])
-            df_copy = df.copy()
-            df_copy['Timestamp'] = pd.to_datetime(df_copy['Timestamp'])
-
-            # Hourly
-            df_copy['hour'] = ((df_copy['Timestamp'] - start_time).dt.total_seconds() // 3600).astype(int)
-            df_copy['hour_str'] = df_copy['hour'].apply(lambda x: (start_time + pd.Timedelta(hours=x)).strftime("%Y-%B-%d %H:00:00"))
-            hourly = df_copy.groupby(['hour_str', 'Class']).size().reset_index(name='Overall')
-            hourly_pivot = hourly.pivot_table(index='hour_str', columns='Class', values='Overall', fill_value=0).reset_index()
-            hourly_pivot.rename(columns={'hour_str': 'Time'}, inplace=True)
-            hourly_pivot.to_excel(writer, sheet_name='Hourly Data', index=False)
-
-            # Daily
-            df_copy['day_str'] = df_copy['Timestamp'].dt.strftime("%Y-%m-%d \n %A")
-            daily = df_copy.groupby(['day_str', 'Class']).size().reset_index(name='Overall')
-            daily_pivot = daily.pivot_table(index='day_str', columns='Class', values='Overall', fill_value=0).reset_index()
-            daily_pivot.rename(columns={'day_str': 'Date'}, inplace=True)
-            daily_pivot.to_excel(writer, sheet_name='Daily Data', index=False)
-
-            # Monthly
-            df_copy['mon_str'] = df_copy['Timestamp'].dt.strftime("%B-%Y")
-            monthly = df_copy.groupby(['mon_str', 'Class']).size().reset_index(name='Overall')
-            monthly_pivot = monthly.pivot_table(index='mon_str', columns='Class', values='Overall', fill_value=0).reset_index()
-            monthly_pivot.rename(columns={'mon_str': 'Date'}, inplace=True)
-            monthly_pivot.to_excel(writer, sheet_name='Monthly Data', index=False)
-
-            fig, ax = plt.subplots(figsize=(10,6))
-            summary_data = []
-            for golongan, counts in vehicle_counts.items():
-                                    summary_data.append([golongan, counts["In"], counts["Out"]])
-            summary_df = pd.DataFrame(summary_data, columns=["Golongan", "Total In", "Total Out"])
-            summary_df.set_index("Golongan")[["Total In", "Total Out"]].plot(kind='bar', ax=ax)
-
-            ax.set_title('Vehicle In/Out Counts by Golongan')
-            ax.set_ylabel('Count')
-            ax.set_xlabel('Class')
-            plt.xticks(rotation=45, ha='right')        
-            plt.tight_layout()
-            
-            img_buf = io.BytesIO()
-            plt.savefig(img_buf, format='png', bbox_inches='tight')
-            img_buf.seek(0)
-            plt.close(fig)
-
-            img_sheet_name = 'Summary Chart'
-            img_sheet = writer.book.create_sheet(img_sheet_name)
-            img_sheet.title = img_sheet_name
-
-            img_openpyxl = OpenpyxlImage(img_buf)
-            img_openpyxl.anchor = 'A1'
-            img_sheet.add_image(img_openpyxl)
-            
-            
-
+        write_excel(file_path, df, settings, vehicle_counts)
         messagebox.showinfo("Success", f"Data saved to {file_path}")
 
     except Exception as e:
-        messagebox.showerror("Error", f"Failed to save data: {e}")
+        messagebox.showerror("Error", f"Failed to save data: {e}")
\ No newline at end of file
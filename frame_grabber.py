@@ -0,0 +1,77 @@
+# core/frame_grabber.py
+import threading
+import time
+
+
+class LatestFrameGrabber:
+    """Reads a live capture continuously and keeps only the newest frame.
+
+    Many backends ignore CAP_PROP_BUFFERSIZE, so a consumer that reads
+    slower than the camera delivers ends up working on stale frames. The
+    grabber thread drains the device at camera speed; read() returns the
+    newest frame not handed out yet, and frames nobody took are counted
+    as dropped.
+    """
+
+    def __init__(self, cap, name="frame-grabber"):
+        self.cap = cap
+        self.name = name
+        self.captured = 0
+        self.dropped = 0
+        self.consumed = 0
+        self.failed_reads = 0
+        self._frame = None
+        self._frame_no = 0
+        self._taken_no = 0
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._grab_loop, daemon=True, name=self.name)
+        self._thread.start()
+        return self
+
+    def _grab_loop(self):
+        while self._running:
+            ret, frame = self.cap.read()
+            if not ret or frame is None:
+                self.failed_reads += 1
+                time.sleep(0.01)
+                continue
+            with self._cond:
+                if self._frame_no > self._taken_no:
+                    self.dropped += 1
+                self._frame = frame
+                self._frame_no += 1
+                self.captured += 1
+                self._cond.notify_all()
+
+    def read(self, timeout=1.0):
+        """(True, frame) with the newest unseen frame, (False, None) if none arrives in time"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._frame_no > self._taken_no or not self._running, timeout):
+                return False, None
+            if self._frame_no <= self._taken_no:
+                return False, None
+            self._taken_no = self._frame_no
+            self.consumed += 1
+            return True, self._frame
+
+    def stop(self, timeout=1.0):
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def stats(self):
+        return {"captured": self.captured, "dropped": self.dropped, "consumed": self.consumed}
+
+    def summary(self):
+        return (f"Camera frames captured {self.captured}, consumed {self.consumed}, "
+                f"dropped {self.dropped}")
\ No newline at end of file
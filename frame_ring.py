@@ -0,0 +1,96 @@
+# core/frame_ring.py
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+SLOT_FREE = 0
+SLOT_BUSY = 1
+HEADER_BYTES = 64  # room for the per-slot state bytes before the frames
+
+
+class FrameRing:
+    """Fixed set of preallocated frame slots in shared memory.
+
+    Only slot indices travel between processes: the writer acquires a free
+    slot, copies a frame into it and sends the index, the reader looks at
+    the slot in place and hands it back with release(). Slot ownership is
+    a state byte in the shared block itself, so a ring pickles down to its
+    name and can be handed to a running process through any queue. Each
+    ring expects a single writer thread.
+    """
+
+    def __init__(self, frame_shape, num_slots):
+        if not 0 < num_slots <= HEADER_BYTES:
+            raise ValueError(f"FrameRing supports 1 to {HEADER_BYTES} slots, got {num_slots}")
+        self.slot_bytes = int(np.prod(frame_shape))
+        self.num_slots = num_slots
+        self.shm = shared_memory.SharedMemory(create=True, size=HEADER_BYTES + self.slot_bytes * num_slots)
+        self._owner_pid = os.getpid()
+        self._map_slots()
+        self._states[:] = SLOT_FREE
+
+    def __getstate__(self):
+        return {
+            "name": self.shm.name,
+            "slot_bytes": self.slot_bytes,
+            "num_slots": self.num_slots,
+            "owner_pid": self._owner_pid,
+        }
+
+    def __setstate__(self, state):
+        self.slot_bytes = state["slot_bytes"]
+        self.num_slots = state["num_slots"]
+        self._owner_pid = state["owner_pid"]
+        self.shm = shared_memory.SharedMemory(name=state["name"])
+        self._map_slots()
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def _map_slots(self):
+        self._states = np.ndarray((self.num_slots,), dtype=np.uint8, buffer=self.shm.buf)
+        self._slots = np.ndarray((self.num_slots, self.slot_bytes), dtype=np.uint8,
+                                 buffer=self.shm.buf, offset=HEADER_BYTES)
+
+    def acquire(self):
+        """Take a free slot index, or None if every slot is in use"""
+        free = np.flatnonzero(self._states == SLOT_FREE)
+        if len(free) == 0:
+            return None
+        slot = int(free[0])
+        self._states[slot] = SLOT_BUSY
+        return slot
+
+    def release(self, slot):
+        """Return a slot once its frame has been consumed"""
+        self._states[slot] = SLOT_FREE
+
+    def fits(self, frame):
+        return frame.dtype == np.uint8 and frame.nbytes <= self.slot_bytes
+
+    def write(self, slot, frame):
+        """Copy a frame into a slot and return the shape needed to read it back"""
+        np.copyto(self._slots[slot, :frame.nbytes], frame.reshape(-1))
+        return frame.shape
+
+    def view(self, slot, shape):
+        """Array view of a slot; only valid until the slot is released"""
+        nbytes = int(np.prod(shape))
+        return self._slots[slot, :nbytes].reshape(shape)
+
+    def close(self):
+        """Unmap the slots and free the shared memory if this process created it"""
+        self._slots = None
+        self._states = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # A view is still referenced somewhere; the mapping goes with it
+            pass
+        if os.getpid() == self._owner_pid:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
\ No newline at end of file
@@ -0,0 +1,163 @@
+# core/inference_server.py
+import os
+import time
+import signal
+from multiprocessing import Queue, Event
+from queue import Empty
+
+from .counter import VehicleCounter, resolve_start_time, compute_line_positions
+from .frame_ring import FrameRing
+from .roi import RegionOfInterest
+from .letterbox import InferenceResizer, DEFAULT_IMGSZ
+
+SERVER_RING_SLOTS = 3
+DEFAULT_BATCH_WINDOW = 0.010  # seconds to wait for frames from other cameras
+DEFAULT_MAX_BATCH = 8
+STOP_REQUEST = None  # put on request_q once the feeders have stopped
+
+
+def camera_feeder(source_id, cap, ring: FrameRing, request_q: Queue, stop_event: Event):
+    """Push frames of one capture into the server, dropping them while it is busy"""
+    while not stop_event.is_set():
+        ret, frame = cap.read()
+        if not ret:
+            time.sleep(0.01)
+            continue
+        if not ring.fits(frame):
+            continue
+        slot = ring.acquire()
+        if slot is None:
+            # Server still holds every slot of this camera: a newer frame will follow
+            continue
+        shape = ring.write(slot, frame)
+        request_q.put((source_id, slot, shape))
+
+
+def _collect_batch(request_q, batch_window, max_batch):
+    """Block for the first request, then gather whatever arrives within the window.
+
+    Returns the batch and whether the stop request was among it; requests
+    queued before the stop request are still served.
+    """
+    request = request_q.get(timeout=0.05)
+    if request is STOP_REQUEST:
+        return [], True
+    batch = [request]
+    deadline = time.perf_counter() + batch_window
+    while len(batch) < max_batch:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        try:
+            request = request_q.get(timeout=remaining)
+        except Empty:
+            break
+        if request is STOP_REQUEST:
+            return batch, True
+        batch.append(request)
+    return batch, False
+
+
+def inference_server(request_q: Queue, result_q: Queue, source_settings: dict,
+                     rings: dict, model_path: str, batch_window=DEFAULT_BATCH_WINDOW,
+                     max_batch=DEFAULT_MAX_BATCH):
+    """One model serving several cameras.
+
+    Frames that arrive within `batch_window` go through a single forward
+    pass; every camera keeps its own ByteTrack tracker and counter.
+    Results are sent as data_update messages tagged with the source id.
+    The server runs until STOP_REQUEST arrives on request_q and answers
+    it with a "stopped" message once every earlier result is queued.
+    """
+    print(f"Inference server started with PID: {os.getpid()}")
+    # Ctrl+C is handled by the parent, which stops the server through request_q
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # One forward pass needs one input size: the largest any camera asks for
+    imgsz = max(settings.get('inference_imgsz', DEFAULT_IMGSZ) for settings in source_settings.values())
+
+    try:
+        from .model_loader import load_model
+        from .tracking import create_tracker, update_tracker
+
+        # Backend and threads follow the first camera's settings
+        model = load_model(model_path, dict(next(iter(source_settings.values())), inference_imgsz=imgsz))
+        result_q.put({"type": "model_ready"})
+    except Exception as e:
+        result_q.put({"type": "model_error", "error": str(e)})
+        return
+    states = {}
+    for source_id, settings in source_settings.items():
+        states[source_id] = {
+            "settings": settings,
+            "tracker": create_tracker(),
+            "counter": VehicleCounter(model.names, resolve_start_time(settings)),
+            "lines": None,
+            "roi": None,
+            "resizer": InferenceResizer(imgsz),
+        }
+
+    batches = 0
+    frames_served = 0
+    stopping = False
+    while not stopping:
+        try:
+            batch, stopping = _collect_batch(request_q, batch_window, max_batch)
+        except Empty:
+            continue
+        if not batch:
+            continue
+
+        try:
+            frames = []
+            for source_id, slot, shape in batch:
+                state = states[source_id]
+                if state["lines"] is None:
+                    state["lines"] = compute_line_positions(state["settings"], shape)
+                    state["roi"] = RegionOfInterest.from_settings(state["settings"], shape, *state["lines"])
+                frame = rings[source_id].view(slot, shape)
+                frames.append(state["resizer"].prepare(state["roi"].crop(frame) if state["roi"] else frame))
+            # Lowest threshold of the batch here, each camera's own threshold below
+            conf = min(states[source_id]["settings"]['confidence_threshold'] for source_id, _, _ in batch)
+            results = model.predict(frames, conf=conf, imgsz=imgsz, verbose=False)
+
+            # Results follow request order, so each tracker sees its frames in sequence
+            for (source_id, slot, shape), result, frame in zip(batch, results, frames):
+                state = states[source_id]
+                settings = state["settings"]
+                boxes = result.boxes.cpu().numpy()
+                boxes = boxes[boxes.conf >= settings['confidence_threshold']]
+                boxes.data[:, :4] = state["resizer"].to_source(boxes.data[:, :4])
+                if state["roi"] is not None:
+                    boxes.data[:, :4] += state["roi"].offset
+                line1_pos, line2_pos = state["lines"]
+
+                track_ids, class_ids, xyxy = update_tracker(state["tracker"], boxes, frame)
+                new_rows = state["counter"].update(track_ids, class_ids, xyxy, line1_pos, line2_pos,
+                                                   settings['line_orientation'])
+                if new_rows:
+                    result_q.put({
+                        "type": "data_update",
+                        "source": source_id,
+                        "counts": state["counter"].counts_snapshot(),
+                        "new_rows": new_rows
+                    })
+        except Exception as e:
+            # One bad batch must not stop counting for every camera
+            print(f"Error in inference server: {e}")
+            continue
+        finally:
+            frames = None
+            for source_id, slot, _ in batch:
+                rings[source_id].release(slot)
+
+        batches += 1
+        frames_served += len(batch)
+        if batches % 500 == 0:
+            print(f"[INFO] Inference server: {frames_served} frames in {batches} batches "
+                  f"({frames_served / batches:.2f} frames/batch)")
+
+    for ring in rings.values():
+        ring.close()
+    result_q.put({"type": "stopped"})
+    print("Inference server received stop signal and is finishing.")
\ No newline at end of file
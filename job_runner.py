@@ -0,0 +1,133 @@
+# core/job_runner.py
+import os
+import glob
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from .detection_store import DETECTION_COLUMNS
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".flv")
+
+# Model loaded once per worker process by _init_worker
+_worker_model = None
+
+
+def find_videos(paths):
+    """Expand files and directories into a sorted list of video files"""
+    videos = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(glob.glob(os.path.join(path, "*"))):
+                if name.lower().endswith(VIDEO_EXTENSIONS):
+                    videos.append(name)
+        else:
+            videos.append(path)
+    return videos
+
+
+def _init_worker(model_path, threads, imgsz):
+    """Limit the math libraries to `threads` and load the model once"""
+    global _worker_model
+    from .model_loader import set_thread_limits, warm_up
+
+    # The thread variables only count if they are set before torch is imported
+    set_thread_limits(threads)
+    from ultralytics import YOLO
+    _worker_model = YOLO(model_path, task="detect")
+    warm_up(_worker_model, imgsz)
+
+
+def _count_job(path, settings, batch_size):
+    from .video_counter import count_video_file
+    return count_video_file(path, _worker_model, settings, batch_size=batch_size)
+
+
+def video_labels(videos):
+    """(label, output stem) per video, unique across the run.
+
+    The label is the path relative to the folder all videos share, so
+    cam1/VID_0001.mp4 and cam2/VID_0001.mp4 stay apart; the stem is the
+    label flattened into a file name, numbered if two still collide.
+    """
+    paths = [os.path.abspath(video) for video in videos]
+    try:
+        root = os.path.commonpath([os.path.dirname(path) for path in paths]) if paths else None
+    except ValueError:
+        root = None  # different drives
+    labels = {}
+    used = set()
+    for video, path in zip(videos, paths):
+        label = (os.path.relpath(path, root) if root else path).replace(os.sep, "/")
+        stem = candidate = os.path.splitext(label)[0].replace(":", "").strip("/").replace("/", "__")
+        number = 1
+        while candidate in used:
+            number += 1
+            candidate = f"{stem}_{number}"
+        used.add(candidate)
+        labels[video] = (label, candidate)
+    return labels
+
+
+def combine_results(results, labels=None):
+    """Merge per-file results into one DataFrame tagged with the source file"""
+    labels = labels or {}
+    frames = []
+    for result in results:
+        df = pd.DataFrame(result["rows"], columns=DETECTION_COLUMNS)
+        df["Source"] = labels.get(result["source"], (os.path.basename(result["source"]),))[0]
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=DETECTION_COLUMNS + ["Source"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def run_jobs(videos, weights, settings, workers=None, threads_per_worker=1,
+             batch_size=1, on_result=None):
+    """Count every video on a pool of worker processes.
+
+    Returns (results, failures) where results are the dicts produced by
+    count_video_file in completion order and failures maps a path to its
+    error message. on_result is called in the parent for each finished file.
+    """
+    from .model_loader import resolve_model_path
+
+    workers = workers or max(1, (os.cpu_count() or 1) // max(1, threads_per_worker))
+    # Export once in the parent so workers never race on the cache
+    model_path = resolve_model_path(weights, settings.get("inference_backend", "pytorch"))
+    results = []
+    failures = {}
+    started = time.perf_counter()
+
+    # Fresh interpreters: torch does not survive fork() reliably
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker,
+                             initargs=(model_path, threads_per_worker,
+                                       settings.get("inference_imgsz", 640))) as pool:
+        futures = {pool.submit(_count_job, path, settings, batch_size): path for path in videos}
+        for done, future in enumerate(as_completed(futures), start=1):
+            path = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                failures[path] = str(e)
+                print(f"[{done}/{len(videos)}] [ERROR] {path}: {e}")
+                continue
+
+            results.append(result)
+            fps = result["frames"] / result["elapsed"] if result["elapsed"] > 0 else 0.0
+            print(f"[{done}/{len(videos)}] {os.path.basename(path)}: {len(result['rows'])} vehicles, "
+                  f"{result['frames']} frames ({fps:.1f} fps)")
+            if result["motion_gate"]:
+                print(f"    {result['motion_gate']}")
+            if on_result:
+                on_result(result)
+
+    elapsed = time.perf_counter() - started
+    total_frames = sum(result["frames"] for result in results)
+    print(f"[INFO] {len(results)}/{len(videos)} files on {workers} workers x {threads_per_worker} threads: "
+          f"{total_frames} frames in {elapsed:.1f}s ({total_frames / elapsed if elapsed > 0 else 0.0:.1f} fps)")
+    return results, failures
\ No newline at end of file
@@ -0,0 +1,43 @@
+# core/letterbox.py
+import cv2
+import numpy as np
+
+DEFAULT_IMGSZ = 640
+IMGSZ_CHOICES = [320, 416, 480, 640, 800, 960, 1280]
+
+
+class InferenceResizer:
+    """Resize frames to the inference size with geometry computed once per resolution.
+
+    The target size matches what ultralytics' LetterBox would compute for
+    the same imgsz, so the predictor only pads the already resized frame
+    instead of resizing it again. Boxes are mapped back with to_source().
+    """
+
+    def __init__(self, imgsz=DEFAULT_IMGSZ):
+        self.imgsz = int(imgsz)
+        self._shape = None
+        self._size = None
+        self._scale = None
+
+    def _geometry(self, shape):
+        if shape != self._shape:
+            (h, w) = shape
+            r = min(self.imgsz / h, self.imgsz / w)
+            new_w, new_h = int(round(w * r)), int(round(h * r))
+            self._shape = shape
+            self._size = (new_w, new_h)
+            self._scale = np.array([new_w / w, new_h / h, new_w / w, new_h / h], dtype=np.float32)
+        return self._size
+
+    def prepare(self, image):
+        """Image resized for the detector (unchanged if already at size)"""
+        size = self._geometry(image.shape[:2])
+        if size == (image.shape[1], image.shape[0]):
+            return image
+        return cv2.resize(image, size, interpolation=cv2.INTER_LINEAR)
+
+    def to_source(self, xyxy):
+        """Map xyxy boxes from the resized image back to the image given to prepare()"""
+        return np.asarray(xyxy, dtype=np.float32) / self._scale
+
@@ -2,11 +2,9 @@ import tkinter as tk
 from tkinter import messagebox
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-import pandas as pd
-from multiprocessing import Process, Queue, Event
-import json
 import sys
 import os
+import threading
 
 from .ui_components import UIComponents
 from .video_handler import VideoHandler
@@ -15,7 +13,7 @@ from .menu_manager import MenuManager
 from .data_manager import DataManager
 from utils.config import ConfigManager
 from utils.constants import MAX_DISPLAY_WIDTH, MAX_DISPLAY_HEIGHT
-from core.exporter import save_to_excel
+from gui.dialogs import ExportProgressDialog
 
 
 class VehicleDetectorApp:
@@ -38,11 +36,16 @@ class VehicleDetectorApp:
         self.detection_manager = DetectionManager(self)
         self.menu_manager = MenuManager(self)
         self.data_manager = DataManager(self)
+        self.export_running = False
         
         # Setup UI
         self.create_widgets()
         self.create_menu()
         self.update_gui_display()
+
+        # Load the model in the background so the first start is instant
+        self.root.after(200, self.detection_manager.start_worker)
+        self.root.after(300, self.data_manager.offer_recovery)
         
         # Window close protocol
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -71,6 +74,7 @@ class VehicleDetectorApp:
         """Force exit the application"""
         try:
             self.detection_manager.cleanup()
+            self.data_manager.close()
             self.video_handler.cleanup()
             self.root.quit()
             self.root.destroy()
@@ -80,9 +84,95 @@ class VehicleDetectorApp:
             sys.exit(1)
 
     def save_to_excel(self):
-        """Save data to Excel file"""
-        save_to_excel(
-            self.data_manager.df, 
-            self.settings, 
-            self.data_manager.vehicle_counts
-        )
\ No newline at end of file
+        """Save data to Excel file in the background"""
+        # pandas/openpyxl/matplotlib are only loaded once something is exported
+        from core.exporter import ask_excel_path, write_excel
+
+        if self.export_running:
+            messagebox.showinfo("Info", "An export is already running.")
+            return
+        # Only the row count is taken here: the store is append-only, so the export
+        # thread builds the DataFrame of exactly these rows while detections keep arriving
+        store = self.data_manager.store
+        rows = len(store)
+        if not rows:
+            messagebox.showinfo("Info", "No data to save.")
+            return
+
+        file_path = ask_excel_path()
+        if not file_path:
+            return
+
+        vehicle_counts = {golongan: dict(counts) for golongan, counts in self.data_manager.vehicle_counts.items()}
+        pivots = self._export_pivots()
+        settings = self.settings.copy()
+        # write_excel computes the pivots itself when the rollups cannot be used
+        self._run_export(file_path, rows, lambda progress: write_excel(
+            file_path, store.to_frame(rows), settings, vehicle_counts, progress=progress, pivots=pivots))
+
+    def export_table(self):
+        """Export detections and rollups as Parquet or CSV in the background"""
+        from core.exporter import ask_table_path, export_table, period_pivots
+
+        if self.export_running:
+            messagebox.showinfo("Info", "An export is already running.")
+            return
+        store = self.data_manager.store
+        rows = len(store)
+        if not rows:
+            messagebox.showinfo("Info", "No data to save.")
+            return
+
+        file_path = ask_table_path()
+        if not file_path:
+            return
+
+        # Rows stream from the store itself; fallback pivots are built in the export thread
+        pivots = self._export_pivots()
+        settings = self.settings.copy()
+
+        def job(progress):
+            table_pivots = pivots
+            if table_pivots is None:
+                table_pivots = period_pivots(store.to_frame(rows), settings)
+            export_table(file_path, store, table_pivots, progress=progress)
+
+        self._run_export(file_path, rows, job)
+
+    def _export_pivots(self):
+        """Hourly/daily/monthly tables from the live rollups, or None if the start time changed"""
+        rollups = self.data_manager.rollups
+        if rollups.matches(self.settings):
+            return rollups.pivots()
+        return None
+
+    def _run_export(self, file_path, total_rows, job):
+        """Run job(progress) in a thread while a progress dialog polls it"""
+        dialog = ExportProgressDialog(self.root, file_path)
+        state = {"progress": (0, total_rows, "Preparing"), "error": None, "finished": False}
+
+        def export():
+            try:
+                job(lambda done, total, stage: state.update(progress=(done, total, stage)))
+            except Exception as e:
+                state["error"] = e
+            finally:
+                state["finished"] = True
+
+        def poll():
+            dialog.set_progress(*state["progress"])
+            if not state["finished"]:
+                self.root.after(100, poll)
+                return
+            dialog.destroy()
+            self.export_running = False
+            self.ui_components.btn_save_data.config(state="normal")
+            if state["error"]:
+                messagebox.showerror("Error", f"Failed to save data: {state['error']}")
+            else:
+                messagebox.showinfo("Success", f"Data saved to {file_path}")
+
+        self.export_running = True
+        self.ui_components.btn_save_data.config(state="disabled")
+        threading.Thread(target=export, daemon=True).start()
+        poll()
\ No newline at end of file
@@ -2,6 +2,9 @@ import tkinter as tk
 from tkinter import messagebox
 
 from gui.dialogs import EnhancedSettingsDialog, TimeDialog
+from gui.overlay import OVERLAY_LEVELS
+from core.preview import PREVIEW_FPS_CHOICES, DEFAULT_PREVIEW_FPS
+from core.letterbox import IMGSZ_CHOICES, DEFAULT_IMGSZ
 import datetime
 import os
 
@@ -18,6 +21,7 @@ class MenuManager:
         # File menu
         file_menu = tk.Menu(menubar, tearoff=0)
         file_menu.add_command(label="Export Data", command=self.app.save_to_excel)
+        file_menu.add_command(label="Export Parquet / CSV", command=self.app.export_table)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.app.on_closing)
         menubar.add_cascade(label="File", menu=file_menu)
@@ -32,6 +36,24 @@ class MenuManager:
         settings_menu = tk.Menu(menubar, tearoff=0)
         settings_menu.add_command(label="Detection Configuration", command=self.open_settings_dialog)
         settings_menu.add_command(label="Time Settings", command=self.open_time_dialog)
+
+        roi_menu = tk.Menu(settings_menu, tearoff=0)
+        roi_mode = self.app.settings.get('roi_mode', 'band') if self.app.settings.get('enable_roi_filter') else "off"
+        self.roi_mode_var = tk.StringVar(value=roi_mode)
+        for label, mode in [("Off (Full Frame)", "off"), ("Band Around Lines", "band"),
+                            ("Margins", "margins"), ("Polygon (Shift+Click)", "polygon")]:
+            roi_menu.add_radiobutton(label=label, value=mode, variable=self.roi_mode_var,
+                                     command=self.apply_roi_mode)
+        roi_menu.add_separator()
+        roi_menu.add_command(label="Clear Polygon", command=self.clear_roi_polygon)
+        settings_menu.add_cascade(label="Region of Interest", menu=roi_menu)
+
+        imgsz_menu = tk.Menu(settings_menu, tearoff=0)
+        self.imgsz_var = tk.IntVar(value=self.app.settings.get('inference_imgsz', DEFAULT_IMGSZ))
+        for size in IMGSZ_CHOICES:
+            imgsz_menu.add_radiobutton(label=f"{size} px", value=size, variable=self.imgsz_var,
+                                       command=self.apply_inference_size)
+        settings_menu.add_cascade(label="Inference Size", menu=imgsz_menu)
         settings_menu.add_separator()
         settings_menu.add_command(label="Reset to Defaults", command=self.reset_all_settings)
         menubar.add_cascade(label="Settings", menu=settings_menu)
@@ -40,6 +62,20 @@ class MenuManager:
         view_menu = tk.Menu(menubar, tearoff=0)
         view_menu.add_command(label="Clear Data", command=self.clear_all_data)
         view_menu.add_command(label="Show Filter Statistics", command=self.show_filter_stats)
+        overlay_menu = tk.Menu(view_menu, tearoff=0)
+        self.overlay_level_var = tk.StringVar(value=self.app.settings.get('overlay_level', "full"))
+        overlay_labels = {"none": "None", "lines": "Lines Only",
+                          "near_lines": "Boxes Near Lines", "full": "Full (Boxes + Labels)"}
+        for level in OVERLAY_LEVELS:
+            overlay_menu.add_radiobutton(label=overlay_labels[level], value=level,
+                                         variable=self.overlay_level_var, command=self.apply_overlay_level)
+        view_menu.add_cascade(label="Detection Overlay", menu=overlay_menu)
+        preview_menu = tk.Menu(view_menu, tearoff=0)
+        self.preview_fps_var = tk.IntVar(value=self.app.settings.get('preview_fps', DEFAULT_PREVIEW_FPS))
+        for fps in PREVIEW_FPS_CHOICES:
+            preview_menu.add_radiobutton(label=f"{fps} FPS", value=fps,
+                                         variable=self.preview_fps_var, command=self.apply_preview_settings)
+        view_menu.add_cascade(label="Preview Rate", menu=preview_menu)
         menubar.add_cascade(label="View", menu=view_menu)
 
         # Help menu
@@ -105,6 +141,47 @@ class MenuManager:
 
         TimeDialog(self.app.root, default_timestamp, apply_time_callback)
 
+    def apply_roi_mode(self):
+        """Switch the inference region of interest"""
+        mode = self.roi_mode_var.get()
+        self.app.settings['enable_roi_filter'] = mode != "off"
+        if mode != "off":
+            self.app.settings['roi_mode'] = mode
+        self.app.new_settings_to_send = self.app.settings.copy()
+
+        if mode == "polygon" and len(self.app.settings.get('roi_polygon') or []) < 3:
+            messagebox.showinfo("Region of Interest",
+                                "Shift+click on the preview to add at least three polygon points.\n"
+                                "Until then the full frame is used.")
+        self.app.config_manager.save_config(self.app.settings, quiet=True)
+
+    def apply_inference_size(self):
+        """Change the resolution frames are resized to before inference"""
+        self.app.settings['inference_imgsz'] = self.imgsz_var.get()
+        # A running session keeps its size (the tracker depends on it); the next start uses the new one
+        self.app.new_settings_to_send = self.app.settings.copy()
+        self.app.config_manager.save_config(self.app.settings, quiet=True)
+
+    def apply_overlay_level(self):
+        """Choose how much detection detail is drawn on the preview"""
+        # Display only, the detection worker does not need to know
+        self.app.settings['overlay_level'] = self.overlay_level_var.get()
+        self.app.config_manager.save_config(self.app.settings, quiet=True)
+
+    def apply_preview_settings(self):
+        """Change the preview frame rate"""
+        self.app.settings['preview_fps'] = self.preview_fps_var.get()
+        if self.app.detection_manager.running:
+            self.app.detection_manager.update_preview_settings()
+        self.app.config_manager.save_config(self.app.settings, quiet=True)
+
+    def clear_roi_polygon(self):
+        """Remove all ROI polygon points"""
+        self.app.settings['roi_polygon'] = []
+        self.app.new_settings_to_send = self.app.settings.copy()
+        if self.app.video_handler.video_source:
+            self.app.video_handler.display_first_frame()
+
     def reset_all_settings(self):
         """Reset all settings to defaults"""
         if messagebox.askyesno("Reset Settings", 
@@ -145,7 +222,10 @@ class MenuManager:
         # Basic settings
         stats_text += f"Detection Confidence: {settings.get('confidence_threshold', 0.5):.2f}\n"
         stats_text += f"Line Distance: {settings.get('line_offset', 50)} pixels\n"
-        stats_text += f"Line Orientation: {settings.get('line_orientation', 'Horizontal')}\n\n"
+        stats_text += f"Line Orientation: {settings.get('line_orientation', 'Horizontal')}\n"
+        stats_text += f"Inference Size: {settings.get('inference_imgsz', 640)} px\n"
+        stats_text += f"Inference Backend: {settings.get('inference_backend', 'pytorch')}\n"
+        stats_text += f"Preview: {settings.get('preview_fps', DEFAULT_PREVIEW_FPS)} FPS\n\n"
         
         # Filter status
         stats_text += "Active Filters:\n"
@@ -158,6 +238,9 @@ class MenuManager:
         # ROI settings
         if settings.get('enable_roi_filter', True):
             stats_text += "ROI Settings:\n"
+            stats_text += f"• Mode: {settings.get('roi_mode', 'band')}\n"
+            stats_text += f"• Band Margin: {settings.get('roi_band_margin', 0.25)*100:.1f}%\n"
+            stats_text += f"• Polygon Points: {len(settings.get('roi_polygon') or [])}\n"
             stats_text += f"• Top Margin: {settings.get('roi_margin_y_top', 0.3)*100:.1f}%\n"
             stats_text += f"• Side Margin: {settings.get('roi_margin_x', 0.1)*100:.1f}%\n"
             stats_text += f"• Max Object Size: {settings.get('max_object_size_ratio', 0.3)*100:.1f}%\n\n"
@@ -186,6 +269,8 @@ ROI (Region of Interest) Filter:
 • Restricts detection to road areas only
 • Filters out objects in sky/building areas
 • Configurable margins for different camera angles
+• Band mode only runs the model around the counting lines
+• Polygon mode: Shift+click on the preview to add points
 
 Size Validation:
 • Filters objects that are too large (likely buildings)
@@ -264,4 +349,4 @@ General Tips:
 • Adjust settings gradually, one at a time
 • Export/import configs to save good settings"""
         
-        messagebox.showinfo("Troubleshooting", troubleshoot_text)
+        messagebox.showinfo("Troubleshooting", troubleshoot_text)
\ No newline at end of file
@@ -0,0 +1,89 @@
+# core/model_loader.py
+import os
+import time
+import shutil
+import hashlib
+
+import numpy as np
+
+BACKENDS = ("pytorch", "onnx", "openvino")
+EXPORT_FORMATS = {"onnx": ".onnx", "openvino": "_openvino_model"}
+
+
+def weights_hash(weights, length=12):
+    """Short content hash of a weights file"""
+    digest = hashlib.sha256()
+    with open(weights, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:length]
+
+
+def export_path(weights, backend):
+    """Where the export of `weights` for `backend` is cached, next to the weights"""
+    stem, _ = os.path.splitext(weights)
+    return f"{stem}.{weights_hash(weights)}{EXPORT_FORMATS[backend]}"
+
+
+def set_thread_limits(threads):
+    """Cap the CPU threads used by Torch, OpenCV and OpenMP based runtimes"""
+    if not threads:
+        return
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(threads)
+
+    import cv2
+    import torch
+
+    cv2.setNumThreads(threads)
+    torch.set_num_threads(threads)
+
+
+def resolve_model_path(weights, backend="pytorch"):
+    """Path to load for the backend, exporting the weights on first use"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend: {backend}")
+    if backend == "pytorch":
+        return weights
+
+    target = export_path(weights, backend)
+    if os.path.exists(target):
+        return target
+
+    from ultralytics import YOLO
+
+    print(f"[INFO] Exporting {weights} to {backend}, this only happens once per weights file...")
+    # Dynamic shapes so batched and resized inputs keep working
+    exported = YOLO(weights).export(format=backend, dynamic=True)
+    shutil.move(str(exported), target)
+    return target
+
+
+def warm_up(model, imgsz):
+    """Run one dummy inference so the first real frame is not slow; returns seconds"""
+    start = time.perf_counter()
+    model.predict(np.zeros((imgsz, imgsz, 3), dtype=np.uint8), imgsz=imgsz, verbose=False)
+    return time.perf_counter() - start
+
+
+def reset_tracker(model):
+    """Drop the persisted tracker state so ids do not leak between sessions"""
+    predictor = getattr(model, "predictor", None)
+    for tracker in getattr(predictor, "trackers", None) or []:
+        tracker.reset()
+
+
+def load_model(weights, settings):
+    """Load the detector for the configured backend and warm it up"""
+    from ultralytics import YOLO
+
+    backend = settings.get("inference_backend", "pytorch")
+    imgsz = settings.get("inference_imgsz", 640)
+    set_thread_limits(settings.get("inference_threads", 0))
+
+    start = time.perf_counter()
+    model = YOLO(resolve_model_path(weights, backend), task="detect")
+    load_time = time.perf_counter() - start
+    warm_up_time = warm_up(model, imgsz)
+    print(f"[INFO] Model loaded with {backend} backend in {load_time:.2f}s, warm-up {warm_up_time:.2f}s")
+    return model
\ No newline at end of file
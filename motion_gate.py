@@ -0,0 +1,90 @@
+# core/motion_gate.py
+import cv2
+
+from .counter import LINE_TOLERANCE
+
+MOTION_GATE_WIDTH = 160  # analysis width in pixels
+GATE_SETTINGS = ("enable_motion_gate", "motion_threshold", "motion_hold_frames")
+
+
+class MotionGate:
+    """Cheap frame differencing over the band around the counting lines.
+
+    Only frames with something moving near the lines need full inference;
+    after motion is seen inference keeps running for `hold_frames` frames
+    so tracks can finish crossing.
+    """
+
+    def __init__(self, threshold=0.002, hold_frames=15, pixel_delta=25):
+        self.threshold = threshold
+        self.hold_frames = hold_frames
+        self.pixel_delta = pixel_delta
+        self.frames_checked = 0
+        self.frames_skipped = 0
+        self._previous = None
+        self._band = None
+        self._hold = 0
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Gate configured from settings, or None when gating is disabled"""
+        if not settings.get("enable_motion_gate", False):
+            return None
+        return cls(
+            threshold=settings.get("motion_threshold", 0.002),
+            hold_frames=settings.get("motion_hold_frames", 15),
+        )
+
+    @staticmethod
+    def settings_key(settings):
+        """The settings a gate is built from; a new gate is only needed when they change"""
+        return tuple(settings.get(name) for name in GATE_SETTINGS)
+
+    def _band_image(self, frame, line1_pos, line2_pos, orientation):
+        (h, w) = frame.shape[:2]
+        margin = 2 * LINE_TOLERANCE
+        start, end = min(line1_pos, line2_pos) - margin, max(line1_pos, line2_pos) + margin
+        if orientation == "Horizontal":
+            band = frame[max(0, start):min(h, end), :]
+        else:
+            band = frame[:, max(0, start):min(w, end)]
+        if band.size == 0:
+            band = frame
+
+        (bh, bw) = band.shape[:2]
+        scale = MOTION_GATE_WIDTH / max(bw, bh)
+        small = cv2.resize(band, (max(1, int(bw * scale)), max(1, int(bh * scale))),
+                           interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def needs_inference(self, frame, line1_pos, line2_pos, orientation):
+        """True if the frame should go through the detector"""
+        self.frames_checked += 1
+        band = (line1_pos, line2_pos, orientation)
+        current = self._band_image(frame, line1_pos, line2_pos, orientation)
+
+        if self._previous is None or band != self._band or current.shape != self._previous.shape:
+            moving = True
+        else:
+            diff = cv2.absdiff(current, self._previous)
+            _, mask = cv2.threshold(diff, self.pixel_delta, 255, cv2.THRESH_BINARY)
+            moving = cv2.countNonZero(mask) >= self.threshold * mask.size
+        self._previous = current
+        self._band = band
+
+        if moving:
+            self._hold = self.hold_frames
+            return True
+        if self._hold > 0:
+            self._hold -= 1
+            return True
+        self.frames_skipped += 1
+        return False
+
+    def summary(self, seconds_per_inference):
+        """One-line report of skipped frames and estimated inference time saved"""
+        saved = self.frames_skipped * seconds_per_inference
+        ratio = self.frames_skipped / self.frames_checked if self.frames_checked else 0.0
+        return (f"Motion gate skipped {self.frames_skipped}/{self.frames_checked} frames "
+                f"({ratio:.0%}), saving about {saved:.1f}s of inference")
\ No newline at end of file
@@ -0,0 +1,152 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from multiprocessing import Process, Queue, Event
+from queue import Empty
+
+import cv2
+
+from cli import write_results
+from core.counter import GOLONGAN_LIST
+from core.frame_ring import FrameRing
+from core.inference_server import (inference_server, camera_feeder, SERVER_RING_SLOTS,
+                                   DEFAULT_BATCH_WINDOW, DEFAULT_MAX_BATCH, STOP_REQUEST)
+from utils.config import ConfigManager
+from utils.helpers import resource_path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Count several live cameras with one shared inference server"
+    )
+    parser.add_argument("sources", nargs="+", help="Webcam indices or stream URLs")
+    parser.add_argument("--configs", nargs="+", default=None,
+                        help="One settings file per source, in the same order (default: config.json for all)")
+    parser.add_argument("-o", "--output-dir", default="data",
+                        help="Directory for the per-camera CSV files written on exit")
+    parser.add_argument("--model", default=resource_path('models/best1.pt'),
+                        help="YOLO weights to load")
+    parser.add_argument("--batch-window", type=float, default=DEFAULT_BATCH_WINDOW * 1000,
+                        help="Milliseconds to wait for frames from other cameras before a forward pass")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH,
+                        help="Largest number of frames in one forward pass")
+    return parser.parse_args(argv)
+
+
+def load_source_settings(sources, configs):
+    if configs and len(configs) != len(sources):
+        raise ValueError("--configs needs exactly one file per source")
+    settings = {}
+    for i, source in enumerate(sources):
+        config_manager = ConfigManager()
+        if configs:
+            config_manager.config_file = configs[i]
+        settings[source] = config_manager.load_config()
+    return settings
+
+
+def main(argv=None):
+    """Run every camera through a single inference server until Ctrl+C"""
+    args = parse_args(argv)
+    sources = [int(source) if source.isdigit() else source for source in args.sources]
+    try:
+        source_settings = load_source_settings(sources, args.configs)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return 2
+
+    caps = {}
+    rings = {}
+    for source in sources:
+        cap = cv2.VideoCapture(source)
+        ret, frame = cap.read() if cap.isOpened() else (False, None)
+        if not ret:
+            print(f"[ERROR] Could not read from source {source}")
+            return 1
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        caps[source] = cap
+        rings[source] = FrameRing(frame.shape, SERVER_RING_SLOTS)
+
+    request_q = Queue()
+    result_q = Queue()
+    stop_event = Event()
+    server = Process(
+        target=inference_server,
+        args=(request_q, result_q, source_settings, rings, args.model,
+              args.batch_window / 1000.0, args.max_batch)
+    )
+    server.start()
+
+    rows = {source: [] for source in sources}
+    counts = {source: {golongan: {"In": 0, "Out": 0} for golongan in GOLONGAN_LIST} for source in sources}
+
+    def record(message):
+        if message["type"] == "data_update":
+            rows[message["source"]].extend(message["new_rows"])
+            counts[message["source"]] = message["counts"]
+
+    feeders = [
+        threading.Thread(target=camera_feeder, args=(source, caps[source], rings[source], request_q, stop_event),
+                         daemon=True)
+        for source in sources
+    ]
+    try:
+        message = result_q.get()
+        if message["type"] == "model_error":
+            print(f"[ERROR] Failed to load YOLO model: {message['error']}")
+            server.join()
+            return 1
+
+        for feeder in feeders:
+            feeder.start()
+
+        last_report = time.time()
+        print("[INFO] Counting, press Ctrl+C to stop")
+        while server.is_alive():
+            try:
+                record(result_q.get(timeout=0.5))
+            except Empty:
+                pass
+
+            if time.time() - last_report > 10:
+                for source in sources:
+                    print(f"[INFO] Source {source}: {len(rows[source])} vehicles")
+                last_report = time.time()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        for feeder in feeders:
+            if feeder.is_alive():
+                feeder.join(timeout=1.0)
+        # Everything counted before the stop request is queued ahead of "stopped"
+        request_q.put(STOP_REQUEST)
+        while server.is_alive() or not result_q.empty():
+            try:
+                message = result_q.get(timeout=0.5)
+            except Empty:
+                continue
+            if message["type"] == "stopped":
+                break
+            record(message)
+        server.join(timeout=5.0)
+        if server.is_alive():
+            server.terminate()
+            server.join()
+        for source in sources:
+            caps[source].release()
+            rings[source].close()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for source in sources:
+        name = f"camera_{source}" if isinstance(source, int) else os.path.basename(str(source)) or "stream"
+        result = {"source": name, "rows": rows[source], "counts": counts[source]}
+        rows_path, counts_path = write_results(result, args.output_dir)
+        print(f"[INFO] Source {source}: saved {rows_path} and {counts_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,70 @@
+# gui/overlay.py
+import cv2
+import numpy as np
+
+OVERLAY_LEVELS = ("none", "lines", "near_lines", "full")
+NEAR_LINE_MARGIN = 0.1  # fraction of the frame either side of the counting lines
+LINE_COLORS = ((0, 255, 0), (255, 0, 0))  # RGB: line 1 green, line 2 red
+ROI_COLOR = (255, 255, 0)
+
+_class_colors = {}
+
+
+def class_color(class_id):
+    """Stable RGB colour per class id"""
+    if class_id not in _class_colors:
+        hsv = np.uint8([[[(class_id * 47) % 180, 200, 255]]])
+        _class_colors[class_id] = tuple(int(c) for c in cv2.cvtColor(hsv, cv2.COLOR_HSV2RGB)[0, 0])
+    return _class_colors[class_id]
+
+
+def draw_overlays(image, detections, level="full", class_names=None):
+    """Draw the worker's detection metadata onto a display-sized RGB image in place.
+
+    Coordinates in `detections` are in source frame pixels and are scaled
+    to the image here, so nothing full-resolution has to reach the GUI.
+    """
+    if level == "none" or detections is None:
+        return image
+
+    (frame_h, frame_w) = detections['shape']
+    (h, w) = image.shape[:2]
+    sx, sy = w / frame_w, h / frame_h
+    line1_pos, line2_pos = detections['lines']
+    horizontal = detections['orientation'] == "Horizontal"
+
+    for pos, color in zip((line1_pos, line2_pos), LINE_COLORS):
+        if horizontal:
+            y = int(pos * sy)
+            cv2.line(image, (0, y), (w, y), color, 2)
+        else:
+            x = int(pos * sx)
+            cv2.line(image, (x, 0), (x, h), color, 2)
+
+    if level == "full" and detections.get('roi'):
+        x0, y0, x1, y1 = detections['roi']
+        cv2.rectangle(image, (int(x0 * sx), int(y0 * sy)), (int(x1 * sx) - 1, int(y1 * sy) - 1), ROI_COLOR, 1)
+
+    boxes = detections['boxes']
+    if level == "lines" or len(boxes) == 0:
+        return image
+    ids, classes = detections['ids'], detections['classes']
+
+    if level == "near_lines":
+        if horizontal:
+            centers, margin = (boxes[:, 1] + boxes[:, 3]) / 2, NEAR_LINE_MARGIN * frame_h
+        else:
+            centers, margin = (boxes[:, 0] + boxes[:, 2]) / 2, NEAR_LINE_MARGIN * frame_w
+        keep = ((centers >= min(line1_pos, line2_pos) - margin) &
+                (centers <= max(line1_pos, line2_pos) + margin))
+        boxes, ids, classes = boxes[keep], ids[keep], classes[keep]
+
+    scaled = (boxes * np.array([sx, sy, sx, sy], dtype=np.float32)).astype(np.int32)
+    for (x1, y1, x2, y2), track_id, class_id in zip(scaled, ids, classes):
+        color = class_color(int(class_id))
+        cv2.rectangle(image, (x1, y1), (x2, y2), color, 2)
+        if level == "full":
+            name = class_names.get(int(class_id), str(class_id)) if class_names else str(class_id)
+            cv2.putText(image, f"{name} #{track_id}", (x1, max(12, y1 - 4)),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.45, color, 1, cv2.LINE_AA)
+    return image
\ No newline at end of file
@@ -0,0 +1,46 @@
+# core/preview.py
+import time
+
+import cv2
+
+DEFAULT_PREVIEW_FPS = 15
+PREVIEW_FPS_CHOICES = [5, 10, 15, 20, 30]
+
+
+class PreviewChannel:
+    """Display-sized preview frames, rate-limited to `fps`.
+
+    Frames are scaled down where they are captured, so the preview never
+    costs more than one small resize per `fps` tick no matter how fast
+    frames are read or inferred.
+    """
+
+    def __init__(self, size, fps=DEFAULT_PREVIEW_FPS):
+        self.size = size
+        self.interval = 1.0 / fps if fps else 0.0
+        self.frames_offered = 0
+        self.frames_sent = 0
+        self._next_due = 0.0
+
+    @classmethod
+    def from_settings(cls, settings, size):
+        return cls(size, settings.get("preview_fps", DEFAULT_PREVIEW_FPS))
+
+    def scale(self, frame, now=None):
+        """Display-sized RGB copy of a BGR frame, or None if no preview is due yet"""
+        self.frames_offered += 1
+        now = time.perf_counter() if now is None else now
+        if now < self._next_due:
+            return None
+        # Stay on the fps grid, but never try to catch up on missed ticks
+        if now - self._next_due < self.interval:
+            self._next_due += self.interval
+        else:
+            self._next_due = now + self.interval
+        self.frames_sent += 1
+
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+
+    def summary(self):
+        return f"Preview sent {self.frames_sent}/{self.frames_offered} frames"
\ No newline at end of file
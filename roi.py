@@ -0,0 +1,101 @@
+# core/roi.py
+import cv2
+import numpy as np
+
+from .counter import LINE_TOLERANCE
+
+MIN_ROI_SIZE = 32  # smaller crops fall back to the full frame
+
+
+class RegionOfInterest:
+    """Rectangle (optionally masked by a polygon) the detector runs on.
+
+    Boxes found in the crop are shifted back by the crop origin so the
+    tracker, the counter and the annotation work in full-frame coordinates.
+    """
+
+    def __init__(self, x0, y0, x1, y1, mask=None):
+        self.x0, self.y0, self.x1, self.y1 = x0, y0, x1, y1
+        self.mask = mask
+        self.offset = np.array([x0, y0, x0, y0], dtype=np.float32)
+
+    @classmethod
+    def from_settings(cls, settings, frame_shape, line1_pos, line2_pos):
+        """ROI for the current settings, or None to use the whole frame"""
+        if not settings.get("enable_roi_filter", False):
+            return None
+
+        (h, w) = frame_shape[:2]
+        horizontal = settings['line_orientation'] == "Horizontal"
+        line_lo, line_hi = min(line1_pos, line2_pos), max(line1_pos, line2_pos)
+        x0, y0, x1, y1 = 0, 0, w, h
+        mask = None
+        mode = settings.get("roi_mode", "band")
+
+        if mode == "band":
+            # Vehicles stretch away from the line they touch, so keep a generous margin
+            margin = int(settings.get("roi_band_margin", 0.25) * (h if horizontal else w))
+            if horizontal:
+                y0, y1 = line_lo - margin, line_hi + margin
+            else:
+                x0, x1 = line_lo - margin, line_hi + margin
+        elif mode == "margins":
+            y0 = int(settings.get("roi_margin_y_top", 0.3) * h)
+            x0 = int(settings.get("roi_margin_x", 0.1) * w)
+            x1 = w - x0
+            # Never cut away the counting lines themselves
+            if horizontal:
+                y0 = min(y0, line_lo - LINE_TOLERANCE)
+            else:
+                x0 = min(x0, line_lo - LINE_TOLERANCE)
+                x1 = max(x1, line_hi + LINE_TOLERANCE)
+        elif mode == "polygon":
+            polygon = settings.get("roi_polygon") or []
+            if len(polygon) < 3:
+                return None
+            points = np.array([[px * w, py * h] for px, py in polygon], dtype=np.int32)
+            x0, y0 = points.min(axis=0)
+            x1, y1 = points.max(axis=0) + 1
+        else:
+            return None
+
+        x0, x1 = max(0, int(x0)), min(w, int(x1))
+        y0, y1 = max(0, int(y0)), min(h, int(y1))
+        if x1 - x0 < MIN_ROI_SIZE or y1 - y0 < MIN_ROI_SIZE or (x0, y0, x1, y1) == (0, 0, w, h):
+            return None
+
+        if mode == "polygon":
+            mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+            cv2.fillPoly(mask, [points - np.array([x0, y0], dtype=np.int32)], 255)
+        return cls(x0, y0, x1, y1, mask)
+
+    def crop(self, frame):
+        """Pixels the detector should see"""
+        crop = frame[self.y0:self.y1, self.x0:self.x1]
+        if self.mask is not None:
+            crop = cv2.bitwise_and(crop, crop, mask=self.mask)
+        return crop
+
+    def to_frame(self, xyxy):
+        """Shift crop-relative xyxy boxes into full-frame coordinates"""
+        return np.asarray(xyxy, dtype=np.float32) + self.offset
+
+
+class RoiSelector:
+    """Recomputes the ROI only when the settings, frame size or lines change"""
+
+    KEYS = ("enable_roi_filter", "roi_mode", "roi_band_margin", "roi_margin_y_top",
+            "roi_margin_x", "line_orientation")
+
+    def __init__(self):
+        self._key = None
+        self._roi = None
+
+    def get(self, settings, frame_shape, line1_pos, line2_pos):
+        polygon = tuple(tuple(point) for point in settings.get("roi_polygon") or [])
+        key = (tuple(settings.get(name) for name in self.KEYS), polygon,
+               tuple(frame_shape[:2]), line1_pos, line2_pos)
+        if key != self._key:
+            self._key = key
+            self._roi = RegionOfInterest.from_settings(settings, frame_shape, line1_pos, line2_pos)
+        return self._roi
\ No newline at end of file
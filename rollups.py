@@ -0,0 +1,87 @@
+# core/rollups.py
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from .detection_store import TIMESTAMP_FORMAT
+
+# Export sheet name and label column for each rollup period
+PERIODS = {
+    "hourly": ("Hourly Data", "Time"),
+    "daily": ("Daily Data", "Date"),
+    "monthly": ("Monthly Data", "Date"),
+}
+
+
+class Rollups:
+    """Counts per time bucket, golongan and direction, kept up to date as rows arrive.
+
+    Buckets match what exporter.period_pivots computes from the raw table:
+    hours are counted from the session start (the user start time, or
+    the first detection), days and months are calendar based.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.start_time = None
+        self.first_timestamp = None
+        self.tables = {period: defaultdict(lambda: defaultdict(int)) for period in PERIODS}
+        self._last = (None, None)
+
+    def _labels(self, timestamp):
+        # Rows of one frame share a timestamp string, bucket it once
+        if self._last[0] != timestamp:
+            moment = datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+            hour = int((moment - self.start_time).total_seconds() // 3600)
+            self._last = (timestamp, (
+                (self.start_time + timedelta(hours=hour)).strftime("%Y-%B-%d %H:00:00"),
+                moment.strftime("%Y-%m-%d \n %A"),
+                moment.strftime("%B-%Y"),
+            ))
+        return self._last[1]
+
+    def add_rows(self, rows, settings=None):
+        """Count counter rows (dicts with Timestamp, Class and Direction)"""
+        for row in rows:
+            if self.start_time is None:
+                self.first_timestamp = row["Timestamp"]
+                self.start_time = datetime.strptime(row["Timestamp"], TIMESTAMP_FORMAT)
+                try:
+                    self.start_time = datetime.strptime((settings or {}).get("start_timestamp_user") or "",
+                                                        TIMESTAMP_FORMAT)
+                except ValueError:
+                    pass
+            for period, label in zip(PERIODS, self._labels(row["Timestamp"])):
+                self.tables[period][label][(row["Class"], row["Direction"])] += 1
+
+    def matches(self, settings):
+        """True if the buckets were built from the start time the export would use"""
+        if self.start_time is None:
+            return False
+        start = settings.get("start_timestamp_user") or self.first_timestamp
+        try:
+            return datetime.strptime(start, TIMESTAMP_FORMAT) == self.start_time
+        except ValueError:
+            return False
+
+    def pivot(self, period, direction=None):
+        """Counts per label (rows) and class (columns), optionally for one direction"""
+        import pandas as pd
+
+        _, label_column = PERIODS[period]
+        table = self.tables[period]
+        classes = sorted({cls for counts in table.values() for cls, _ in counts})
+        records = []
+        for label in sorted(table):
+            counts = table[label]
+            totals = defaultdict(int)
+            for (cls, row_direction), count in counts.items():
+                if direction is None or row_direction == direction:
+                    totals[cls] += count
+            records.append([label] + [totals[cls] for cls in classes])
+        return pd.DataFrame(records, columns=[label_column] + classes)
+
+    def pivots(self):
+        """(sheet name, DataFrame) for every period, the layout period_pivots returns"""
+        return [(sheet_name, self.pivot(period)) for period, (sheet_name, _) in PERIODS.items()]
\ No newline at end of file
@@ -0,0 +1,197 @@
+# core/seek_index.py
+import os
+import json
+import bisect
+import hashlib
+import threading
+from collections import OrderedDict
+
+import cv2
+
+SEEK_INDEX_DIR = os.path.join("data", "seek_index")
+THUMBNAIL_CACHE_SIZE = 64
+HASH_SAMPLE_BYTES = 1 << 20
+
+
+def file_key(path, length=16):
+    """Content key of a video: its size plus hashes of the first and last MB"""
+    size = os.path.getsize(path)
+    digest = hashlib.sha256(str(size).encode())
+    with open(path, "rb") as f:
+        digest.update(f.read(HASH_SAMPLE_BYTES))
+        if size > 2 * HASH_SAMPLE_BYTES:
+            f.seek(size - HASH_SAMPLE_BYTES)
+            digest.update(f.read(HASH_SAMPLE_BYTES))
+    return digest.hexdigest()[:length]
+
+
+def scan_keyframes(path, fps):
+    """Frame numbers of the keyframes, read from packet flags without decoding (needs PyAV)"""
+    try:
+        import av
+    except ImportError:
+        return None
+    keyframes = set()
+    with av.open(path) as container:
+        stream = container.streams.video[0]
+        start = stream.start_time or 0
+        for packet in container.demux(stream):
+            if packet.is_keyframe and packet.pts is not None:
+                keyframes.add(int(round(float((packet.pts - start) * stream.time_base) * fps)))
+    return sorted(keyframes)
+
+
+class SeekIndex:
+    """fps, frame count and keyframe positions of one video file"""
+
+    def __init__(self, key, fps, frame_count, keyframes=None):
+        self.key = key
+        self.fps = fps
+        self.frame_count = frame_count
+        self.keyframes = keyframes or []
+
+    def snap(self, pos):
+        """Cheapest frame to show for `pos`: the keyframe at or before it, else the whole second"""
+        if self.keyframes:
+            i = bisect.bisect_right(self.keyframes, pos) - 1
+            return self.keyframes[max(i, 0)]
+        step = max(1, int(round(self.fps)))
+        return pos - pos % step
+
+    @staticmethod
+    def _file(index_dir, key):
+        return os.path.join(index_dir, f"{key}.json")
+
+    @classmethod
+    def load(cls, key, index_dir=SEEK_INDEX_DIR):
+        try:
+            with open(cls._file(index_dir, key), "r") as f:
+                data = json.load(f)
+            return cls(key, data["fps"], data["frame_count"], data.get("keyframes"))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, index_dir=SEEK_INDEX_DIR):
+        try:
+            os.makedirs(index_dir, exist_ok=True)
+            with open(self._file(index_dir, self.key), "w") as f:
+                json.dump({"fps": self.fps, "frame_count": self.frame_count, "keyframes": self.keyframes}, f)
+        except OSError as e:
+            print(f"[WARNING] Could not save seek index: {e}")
+
+
+def build_seek_index(path, index_dir=SEEK_INDEX_DIR):
+    """The stored index of a video file, built and stored on first use"""
+    key = file_key(path)
+    index = SeekIndex.load(key, index_dir)
+    if index is not None:
+        return index
+
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    try:
+        keyframes = scan_keyframes(path, fps)
+    except Exception as e:
+        print(f"[WARNING] Could not scan keyframes of {path}: {e}")
+        keyframes = None
+    index = SeekIndex(key, fps, frame_count, keyframes)
+    index.save(index_dir)
+    print(f"[INFO] Seek index built: {frame_count} frames, "
+          f"{len(index.keyframes) if keyframes is not None else 'no'} keyframes")
+    return index
+
+
+class FrameSeeker:
+    """Decodes trackbar previews on its own capture in a background thread.
+
+    Only the newest request is served, older ones are dropped. While
+    dragging, positions snap to the nearest earlier keyframe (the cheapest
+    frame to decode), and decoded thumbnails are kept in an LRU cache so
+    scrubbing back over a stretch costs nothing. `on_frame(pos, frame_no,
+    rgb)` is called from the seeker thread.
+    """
+
+    def __init__(self, path, size, on_frame, cache_size=THUMBNAIL_CACHE_SIZE, index_dir=SEEK_INDEX_DIR):
+        self.path = path
+        self.size = size
+        self.on_frame = on_frame
+        self.cache_size = cache_size
+        self.index_dir = index_dir
+        self.index = None
+        self.requests = 0
+        self.superseded = 0
+        self.cache_hits = 0
+        self.decoded = 0
+        self._cache = OrderedDict()
+        self._pending = None
+        self._cond = threading.Condition()
+        self._running = True
+        threading.Thread(target=self._build_index, daemon=True, name="seek-index").start()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="frame-seeker")
+        self._thread.start()
+
+    def _build_index(self):
+        try:
+            self.index = build_seek_index(self.path, self.index_dir)
+        except Exception as e:
+            print(f"[WARNING] Could not build seek index: {e}")
+
+    def request(self, pos, exact=False):
+        """Ask for a preview of frame `pos`; replaces any request not started yet"""
+        with self._cond:
+            if self._pending is not None:
+                self.superseded += 1
+            self._pending = (int(pos), exact)
+            self.requests += 1
+            self._cond.notify()
+
+    def _thumbnail(self, cap, frame_no):
+        thumb = self._cache.get(frame_no)
+        if thumb is not None:
+            self._cache.move_to_end(frame_no)
+            self.cache_hits += 1
+            return thumb
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_no)
+        ret, frame = cap.read()
+        if not ret:
+            return None
+        self.decoded += 1
+        thumb = cv2.cvtColor(cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2RGB)
+        self._cache[frame_no] = thumb
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return thumb
+
+    def _run(self):
+        cap = None
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or not self._running)
+                if not self._running:
+                    break
+                pos, exact = self._pending
+                self._pending = None
+            try:
+                if cap is None:
+                    cap = cv2.VideoCapture(self.path)
+                index = self.index
+                frame_no = pos if exact or index is None else index.snap(pos)
+                thumb = self._thumbnail(cap, frame_no)
+                if thumb is not None:
+                    self.on_frame(pos, frame_no, thumb)
+            except Exception as e:
+                print(f"[WARNING] Seek preview for frame {pos} failed: {e}")
+        if cap is not None:
+            cap.release()
+
+    def summary(self):
+        return (f"Seek previews requested {self.requests}, superseded {self.superseded}, "
+                f"cache hits {self.cache_hits}, decoded {self.decoded}")
+
+    def close(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout=1.0)
\ No newline at end of file
@@ -1,13 +1,15 @@
 import cv2
 import tkinter as tk
 import ttkbootstrap as ttk
-import sys
 import threading
 import time
 
 from ttkbootstrap.constants import *
 from tkinter import messagebox
 
+from .camera_discovery import CameraCache, discover_cameras, backend_name
+from .capture_pool import capture_pool
+
 class WebcamSelectionDialog:
     def __init__(self, parent, callback):
         self.callback = callback
@@ -15,6 +17,8 @@ class WebcamSelectionDialog:
         self.detection_thread = None
         self.detection_complete = False
         self.available_cameras = []
+        self.camera_cache = CameraCache()
+        self.listed_indices = []
         self.parent = parent
 
         # Get screen dimensions from parent
@@ -107,7 +111,11 @@ class WebcamSelectionDialog:
         self.camera_listbox.bind('<<ListboxSelect>>', self.on_camera_select)
         self.camera_listbox.bind('<Double-Button-1>', self.on_double_click)
         
-        # Start detection in background
+        # Show the cameras found last time right away, probe again in background
+        cached = self.camera_cache.load()
+        if cached:
+            self.available_cameras = cached
+            self.update_camera_list(refreshing=True)
         self.start_camera_detection()
         
         # Handle dialog close
@@ -125,69 +133,10 @@ class WebcamSelectionDialog:
         self.detection_thread.start()
     
     def detect_cameras_threaded(self):
-        """Detect cameras in background thread with optimized approach"""
+        """Probe camera devices in parallel, then refresh the list and the cache"""
         try:
-            cameras = []
-            max_cameras = 10  # Check up to 10 camera indices
-            
-            for i in range(max_cameras):
-                try:
-                    # Use different backends based on platform
-                    backends = []
-                    if sys.platform.startswith('win'):
-                        backends = [cv2.CAP_DSHOW, cv2.CAP_MSMF]
-                    elif sys.platform.startswith('linux'):
-                        backends = [cv2.CAP_V4L2, cv2.CAP_ANY]
-                    else:  # macOS
-                        backends = [cv2.CAP_AVFOUNDATION, cv2.CAP_ANY]
-                    
-                    camera_found = False
-                    for backend in backends:
-                        try:
-                            cap = cv2.VideoCapture(i, backend)
-                            
-                            # Set timeout properties
-                            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-                            
-                            if cap.isOpened():
-                                # Try to read a frame with timeout
-                                start_time = time.time()
-                                ret, frame = cap.read()
-                                read_time = time.time() - start_time
-                                
-                                if ret and frame is not None and frame.size > 0 and read_time < 2.0:
-                                    # Get camera properties
-                                    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                                    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                                    fps = cap.get(cv2.CAP_PROP_FPS)
-                                    
-                                    # Try to get a more descriptive name
-                                    backend_name = self.get_backend_name(backend)
-                                    
-                                    camera_info = {
-                                        'index': i,
-                                        'name': f"Camera {i} ({backend_name})",
-                                        'resolution': f"{width}x{height}",
-                                        'fps': f"{fps:.0f}" if fps > 0 else "30",
-                                        'backend': backend
-                                    }
-                                    cameras.append(camera_info)
-                                    camera_found = True
-                                    break  # Found working camera with this backend
-                            
-                            cap.release()
-                            
-                        except Exception as e:
-                            print(f"Error testing camera {i} with backend {backend}: {e}")
-                            continue
-                    
-                    if camera_found:
-                        continue
-                        
-                except Exception as e:
-                    print(f"Error testing camera {i}: {e}")
-                    continue
-            
+            cameras = discover_cameras(preferred=self.camera_cache.preferred_backends(), pool=capture_pool)
+            self.camera_cache.save(cameras)
             self.available_cameras = cameras
             
             # Schedule GUI update on main thread
@@ -201,39 +150,53 @@ class WebcamSelectionDialog:
     
     def get_backend_name(self, backend):
         """Get human-readable backend name"""
-        backend_names = {
-            cv2.CAP_DSHOW: "DirectShow",
-            cv2.CAP_MSMF: "Media Foundation",
-            cv2.CAP_V4L2: "Video4Linux2",
-            cv2.CAP_AVFOUNDATION: "AVFoundation",
-            cv2.CAP_ANY: "Default"
-        }
-        return backend_names.get(backend, "Unknown")
+        return backend_name(backend)
     
-    def update_camera_list(self):
+    def update_camera_list(self, refreshing=False):
         """Update GUI with detected cameras"""
         try:
-            self.progress.stop()
-            self.progress.pack_forget()
+            if not self.dialog.winfo_exists():
+                return
+            if not refreshing:
+                self.progress.stop()
+                self.progress.pack_forget()
             
             if self.available_cameras:
                 self.title_label.config(text="Select Webcam")
-                self.status_label.config(text=f"Found {len(self.available_cameras)} camera(s)")
+                if refreshing:
+                    self.status_label.config(text=f"{len(self.available_cameras)} camera(s) from last scan, checking...")
+                else:
+                    self.status_label.config(text=f"Found {len(self.available_cameras)} camera(s)")
                 
                 # Show camera list
                 self.camera_frame.pack(fill=BOTH, expand=True, pady=(10, 0))
                 
+                # Keep the user's choice when the background scan replaces the list
+                selection = self.camera_listbox.curselection()
+                selected_index = None
+                if selection and self.camera_listbox.size() > selection[0]:
+                    selected_index = self.listed_indices[selection[0]]
+                
                 # Populate listbox
                 self.camera_listbox.delete(0, tk.END)
+                self.listed_indices = [camera['index'] for camera in self.available_cameras]
                 for camera in self.available_cameras:
                     display_text = f"{camera['name']} - {camera['resolution']} @ {camera['fps']}fps"
                     self.camera_listbox.insert(tk.END, display_text)
                 
-                # Auto-select first camera
-                if self.available_cameras:
-                    self.camera_listbox.selection_set(0)
-                    self.camera_listbox.activate(0)
-                    self.on_camera_select(None)
+                # Auto-select the previous choice or the first camera
+                row = self.listed_indices.index(selected_index) if selected_index in self.listed_indices else 0
+                self.camera_listbox.selection_set(row)
+                self.camera_listbox.activate(row)
+                self.on_camera_select(None)
+                
+            elif self.camera_listbox.size():
+                # A rescan found nothing after cached cameras were shown
+                self.camera_listbox.delete(0, tk.END)
+                self.listed_indices = []
+                self.title_label.config(text="No Webcams Found")
+                self.status_label.config(text="No webcams detected on this system.")
+                self.on_camera_select(None)
                 
             else:
                 self.title_label.config(text="No Webcams Found")
@@ -263,7 +226,7 @@ class WebcamSelectionDialog:
                 ttk.Button(button_frame, text="Cancel", command=self.cancel, 
                           bootstyle="secondary").pack(side=RIGHT)
             
-            self.detection_complete = True
+            self.detection_complete = not refreshing
             
         except Exception as e:
             print(f"Error updating camera list: {e}")
@@ -331,12 +294,8 @@ class WebcamSelectionDialog:
         
         def test_in_background():
             try:
-                # Use the same backend that worked during detection
-                cap = cv2.VideoCapture(camera_index, backend)
-                
-                # Optimize for quick test
-                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-                cap.set(cv2.CAP_PROP_FPS, 30)
+                # Reuse the handle discovery left open, or open it with the backend that worked
+                cap = capture_pool.acquire(camera_index, backend)
                 
                 success = False
                 error_msg = ""
@@ -354,7 +313,11 @@ class WebcamSelectionDialog:
                 else:
                     error_msg = "Failed to open camera"
                 
-                cap.release()
+                # Keep a working camera open for when it gets selected
+                if success:
+                    capture_pool.park(camera_index, cap, backend)
+                else:
+                    cap.release()
                 
                 # Update UI in main thread
                 def update_ui():
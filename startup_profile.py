@@ -0,0 +1,36 @@
+import sys
+import time
+
+HEAVY_MODULES = ("torch", "ultralytics", "pandas", "matplotlib", "openpyxl", "pyarrow", "cv2", "PIL", "numpy")
+
+enabled = False
+_start = time.perf_counter()
+_marks = {}
+
+
+def enable(start=None):
+    """Turn profiling on; `start` is the perf_counter value startup is measured from"""
+    global enabled, _start
+    enabled = True
+    if start is not None:
+        _start = start
+
+
+def mark(label):
+    """Print the time since start the first time a milestone is reached"""
+    if not enabled or label in _marks:
+        return
+    elapsed = time.perf_counter() - _start
+    previous = max(_marks.values(), default=0.0)
+    _marks[label] = elapsed
+    print(f"[PROFILE] {label:<32} {elapsed * 1000:8.1f} ms  (+{(elapsed - previous) * 1000:.1f} ms)")
+
+
+def report_modules():
+    """Which heavy modules are already imported at this point"""
+    if not enabled:
+        return
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    deferred = [name for name in HEAVY_MODULES if name not in sys.modules]
+    print(f"[PROFILE] Loaded:   {', '.join(loaded) or '-'}")
+    print(f"[PROFILE] Deferred: {', '.join(deferred) or '-'}")
\ No newline at end of file
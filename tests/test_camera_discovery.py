@@ -0,0 +1,106 @@
+import threading
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+from core.camera_discovery import CameraCache, discover_cameras, probe_camera
+
+BACKENDS = [cv2.CAP_V4L2, cv2.CAP_ANY]
+
+
+class FakeCapture:
+    """Stands in for cv2.VideoCapture; `gate` makes read() block until it is set"""
+
+    def __init__(self, opened=True, gate=None):
+        self.opened = opened
+        self.gate = gate
+        self.released = False
+
+    def set(self, prop, value):
+        return True
+
+    def isOpened(self):
+        return self.opened
+
+    def read(self):
+        if self.gate is not None:
+            self.gate.wait()
+        return True, np.zeros((480, 640, 3), dtype=np.uint8)
+
+    def get(self, prop):
+        return {cv2.CAP_PROP_FRAME_WIDTH: 640, cv2.CAP_PROP_FRAME_HEIGHT: 480, cv2.CAP_PROP_FPS: 30}.get(prop, 0)
+
+    def release(self):
+        self.released = True
+
+
+class FakeDevices:
+    """Capture factory over a dict of index -> capture kwargs, recording every handle it opens"""
+
+    def __init__(self, devices):
+        self.devices = devices
+        self.opened = []
+
+    def __call__(self, index, backend):
+        cap = FakeCapture(**self.devices.get(index, {"opened": False}))
+        self.opened.append((index, backend, cap))
+        return cap
+
+
+def test_hanging_probe_is_skipped_and_released_later():
+    gate = threading.Event()
+    devices = FakeDevices({0: {}, 1: {"gate": gate}})
+
+    cameras = discover_cameras([(0, "Front"), (1, None)], BACKENDS, devices, timeout=0.2)
+
+    assert [c["index"] for c in cameras] == [0]
+    assert cameras[0]["name"].startswith("Front")
+    assert cameras[0]["resolution"] == "640x480"
+
+    # The abandoned probe finishes on its own and lets go of the device
+    gate.set()
+    for thread in threading.enumerate():
+        if thread.name == "camera-probe-1":
+            thread.join(1.0)
+    assert [cap.released for index, _, cap in devices.opened if index == 1] == [True]
+
+
+def test_device_that_fails_to_open_tries_every_backend():
+    devices = FakeDevices({})
+
+    assert probe_camera(3, BACKENDS, devices) is None
+    assert [backend for _, backend, _ in devices.opened] == BACKENDS
+    assert all(cap.released for _, _, cap in devices.opened)
+    assert discover_cameras([(3, None)], BACKENDS, FakeDevices({}), timeout=1.0) == []
+
+
+def test_preferred_backend_is_tried_first():
+    devices = FakeDevices({0: {}})
+
+    cameras = discover_cameras([(0, None)], BACKENDS, devices, timeout=1.0, preferred={0: cv2.CAP_ANY})
+
+    assert cameras[0]["backend"] == cv2.CAP_ANY
+    assert [backend for _, backend, _ in devices.opened] == [cv2.CAP_ANY]
+
+
+def test_cache_round_trip(tmp_path):
+    cache = CameraCache(str(tmp_path / "data" / "cameras.json"))
+    assert cache.load() == []
+
+    cameras = [{"index": 0, "name": "Camera 0 (Default)", "resolution": "640x480", "fps": "30",
+                "backend": cv2.CAP_ANY}]
+    cache.save(cameras)
+
+    assert cache.load() == cameras
+    assert cache.preferred_backends() == {0: cv2.CAP_ANY}
+
+
+def test_cache_ignores_corrupt_file(tmp_path):
+    path = tmp_path / "cameras.json"
+    path.write_text("{not json")
+    assert CameraCache(str(path)).load() == []
+
+    path.write_text('[{"name": "no index"}, 5]')
+    assert CameraCache(str(path)).load() == []
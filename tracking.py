@@ -0,0 +1,22 @@
+# core/tracking.py
+from ultralytics.trackers.byte_tracker import BYTETracker
+from ultralytics.utils import IterableSimpleNamespace, yaml_load
+from ultralytics.utils.checks import check_yaml
+
+
+def create_tracker(tracker_cfg="bytetrack.yaml", frame_rate=30):
+    """Standalone ByteTrack instance, independent of any YOLO predictor"""
+    cfg = IterableSimpleNamespace(**yaml_load(check_yaml(tracker_cfg)))
+    return BYTETracker(args=cfg, frame_rate=frame_rate)
+
+
+def update_tracker(tracker, boxes, frame=None):
+    """Associate one frame of detections and return (track_ids, class_ids, xyxy)
+
+    `boxes` is an ultralytics Boxes object already moved to numpy.
+    """
+    tracks = tracker.update(boxes, frame)
+    if len(tracks) == 0:
+        return [], [], []
+    # Each row is x1, y1, x2, y2, track_id, score, cls, idx
+    return tracks[:, 4].astype(int).tolist(), tracks[:, 6].astype(int).tolist(), tracks[:, :4]
\ No newline at end of file
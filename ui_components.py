@@ -2,6 +2,8 @@ import tkinter as tk
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
+from gui.virtual_table import VirtualTable
+
 
 class UIComponents:
     def __init__(self, root):
@@ -11,6 +13,7 @@ class UIComponents:
         self.time_label = None
         self.start_stop_button = None
         self.tree = None
+        self.table = None
         self.trackbar_var = tk.DoubleVar()
 
     def create_main_layout(self):
@@ -112,9 +115,9 @@ class UIComponents:
         self.tree.heading("Direction", text="Direction")
         self.tree.column("Direction", width=100, anchor=CENTER)
 
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(tree_frame, orient=VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        # Scrollbar; only the visible rows live in the tree
+        scrollbar = ttk.Scrollbar(tree_frame, orient=VERTICAL)
+        self.table = VirtualTable(self.tree, scrollbar)
 
         # Pack tree and scrollbar
         self.tree.pack(side=LEFT, fill=BOTH, expand=True)
@@ -148,10 +151,12 @@ class UIComponents:
     def setup_callbacks(self, app):
         """Setup UI callbacks"""
         self.video_label.bind("<Button-1>", app.video_handler.set_detection_line)
+        self.video_label.bind("<Shift-Button-1>", app.video_handler.add_roi_point)
         self.start_stop_button.config(command=app.detection_manager.toggle_detection)
         self.btn_save_data.config(command=app.save_to_excel)
+        self.table.row_source = app.data_manager.get_rows
         
-        # # Trackbar callbacks
-        # self.trackbar.config(command=app.video_handler.on_trackbar_drag)
-        # self.trackbar.bind("<ButtonPress-1>", app.video_handler.on_trackbar_press)
-        # self.trackbar.bind("<ButtonRelease-1>", app.video_handler.on_trackbar_release)
\ No newline at end of file
+        # Trackbar callbacks; seek previews are decoded in the background
+        self.trackbar.config(command=app.video_handler.on_trackbar_drag)
+        self.trackbar.bind("<ButtonPress-1>", app.video_handler.on_trackbar_press)
+        self.trackbar.bind("<ButtonRelease-1>", app.video_handler.on_trackbar_release)
\ No newline at end of file
@@ -0,0 +1,118 @@
+# core/video_counter.py
+import os
+import time
+import cv2
+from datetime import datetime, timedelta
+
+from .counter import VehicleCounter, resolve_start_time, compute_line_positions, extract_tracks
+from .motion_gate import MotionGate
+from .roi import RegionOfInterest
+from .letterbox import InferenceResizer, DEFAULT_IMGSZ
+from .model_loader import reset_tracker
+
+
+def open_video(path):
+    """Open a video file and return (cap, fps, total_frames)"""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Could not open video file: {path}")
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    if fps == 0 or fps > 60:
+        fps = 30
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    return cap, fps, total_frames
+
+
+def file_start_time(path, settings, fps, total_frames):
+    """Start timestamp for a recording: user setting first, then derived from the file mtime.
+
+    The mtime is written when recording ends, so the recording's length is
+    taken off it; files whose frame count is unknown start at the mtime.
+    """
+    end_time = datetime.fromtimestamp(os.path.getmtime(path))
+    duration = timedelta(seconds=total_frames / fps) if total_frames > 0 else timedelta(0)
+    return resolve_start_time(settings, fallback=end_time - duration)
+
+
+def count_video_file(path, model, settings, batch_size=1, progress_callback=None):
+    """Run the counting pipeline over a whole file as fast as decoding allows.
+
+    With batch_size > 1 the decoded frames are sent to the model in batches;
+    the tracker and the line-crossing logic still see them one by one in
+    frame order. Frames rejected by the motion gate (when enabled in the
+    settings) only advance the frame clock. Returns a dict with the counted
+    rows, the per-golongan counts, the number of frames processed, the
+    wall-clock time spent and the motion gate report.
+    """
+    cap, fps, total_frames = open_video(path)
+    reset_tracker(model)
+    counter = VehicleCounter(model.names, file_start_time(path, settings, fps, total_frames), fps)
+    orientation = settings['line_orientation']
+    gate = MotionGate.from_settings(settings)
+    batch_size = max(1, int(batch_size))
+    rows = []
+    batch = []  # decoded frames, None for frames the gate skipped
+    batch_frames = 0
+    line_positions = None
+    roi = None
+    resizer = InferenceResizer(settings.get('inference_imgsz', DEFAULT_IMGSZ))
+    inference_time = 0.0
+    inferred_frames = 0
+
+    start = time.perf_counter()
+    try:
+        while True:
+            ret, frame = cap.read()
+            if ret:
+                if line_positions is None:
+                    line_positions = compute_line_positions(settings, frame.shape)
+                    roi = RegionOfInterest.from_settings(settings, frame.shape, *line_positions)
+                if gate is None or gate.needs_inference(frame, *line_positions, orientation):
+                    batch.append(resizer.prepare(roi.crop(frame) if roi else frame))
+                    batch_frames += 1
+                elif batch:
+                    batch.append(None)
+                else:
+                    counter.advance()
+
+            if batch and (not ret or batch_frames >= batch_size):
+                # One forward pass for the batch, results come back in frame order
+                inference_start = time.perf_counter()
+                results = iter(model.track([f for f in batch if f is not None], persist=True,
+                                           tracker="bytetrack.yaml", imgsz=resizer.imgsz,
+                                           conf=settings['confidence_threshold'], verbose=False))
+                inference_time += time.perf_counter() - inference_start
+                inferred_frames += batch_frames
+
+                line1_pos, line2_pos = line_positions
+                for entry in batch:
+                    if entry is None:
+                        counter.advance()
+                        continue
+                    track_ids, class_ids, boxes = extract_tracks(next(results))
+                    if len(boxes):
+                        boxes = resizer.to_source(boxes)
+                        if roi:
+                            boxes = roi.to_frame(boxes)
+                    rows.extend(counter.update(track_ids, class_ids, boxes, line1_pos, line2_pos, orientation))
+                batch = []
+                batch_frames = 0
+
+                if progress_callback:
+                    progress_callback(counter.frame_num, total_frames)
+
+            if not ret:
+                break
+    finally:
+        cap.release()
+
+    return {
+        "source": path,
+        "rows": rows,
+        "counts": counter.counts_snapshot(),
+        "frames": counter.frame_num,
+        "batch_size": batch_size,
+        "elapsed": time.perf_counter() - start,
+        "inference_time": inference_time,
+        "motion_gate": gate.summary(inference_time / inferred_frames if inferred_frames else 0.0) if gate else None,
+    }
\ No newline at end of file
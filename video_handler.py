@@ -1,12 +1,16 @@
 import cv2
-import sys
+import numpy as np
 import os
 from tkinter import filedialog, messagebox
 from PIL import Image, ImageTk
-import pandas as pd
 
 from utils.constants import MAX_DISPLAY_WIDTH, MAX_DISPLAY_HEIGHT
+from utils import startup_profile
+from utils.helpers import format_time
 from core.source_webcam import WebcamSelectionDialog
+from core.frame_grabber import LatestFrameGrabber
+from core.capture_pool import capture_pool
+from core.seek_index import FrameSeeker
 
 
 class VideoHandler:
@@ -14,12 +18,17 @@ class VideoHandler:
         self.app = app
         self.video_source = None
         self.cap = None
+        self.grabber = None
+        self.capture_index = None  # webcam index of self.cap, so it can go back to the pool
         self.is_video_file = False
         self.is_webcam = False
         self.is_seeking = False
+        self.seeker = None
+        self.pending_seek = None  # applied by the feed thread while detection runs
         self.total_frames = 0
         self.video_fps = 30
         self.frame_delay = 1.0 / self.video_fps
+        self.frame_shape = None
 
     def open_webcam_selection(self):
         """Open optimized webcam selection dialog"""
@@ -60,7 +69,7 @@ class VideoHandler:
         self.is_video_file = not self.is_webcam
 
         # Handle existing data
-        if not self.app.data_manager.df.empty:
+        if len(self.app.data_manager.store):
             response = messagebox.askyesno(
                 "Existing Data",
                 "Do you want to keep the previous detection data?"
@@ -91,22 +100,17 @@ class VideoHandler:
 
     def _init_video_capture_optimized(self):
         """Optimized video capture initialization"""
-        if self.cap:
-            self.cap.release()
+        self._release_capture()
+        # Shape of the previous source must not size the next frame ring
+        self.frame_shape = None
 
         if self.video_source is not None:
             if self.is_webcam:
-                if sys.platform.startswith('win'):
-                    # Use DirectShow on Windows for faster webcam access
-                    self.cap = cv2.VideoCapture(self.video_source, cv2.CAP_DSHOW)
-                else:
-                    self.cap = cv2.VideoCapture(self.video_source)
+                # Takes over the handle the webcam dialog already opened and configured, if any
+                self.cap = capture_pool.acquire(self.video_source)
+                self.capture_index = self.video_source
                 
                 if self.cap and self.cap.isOpened():
-                    # Optimize webcam settings for performance
-                    self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-                    self.cap.set(cv2.CAP_PROP_FPS, 30)
-                    
                     # Try to get actual FPS
                     actual_fps = self.cap.get(cv2.CAP_PROP_FPS)
                     self.video_fps = actual_fps if actual_fps > 0 else 30
@@ -120,6 +124,9 @@ class VideoHandler:
                         self.video_fps = 30
                     self.frame_delay = ((1.0 / self.video_fps) / 
                                       self.app.settings['video_playback_speed'])
+                    # Trackbar previews decode on their own capture, off the Tk thread
+                    self.seeker = FrameSeeker(self.video_source, (MAX_DISPLAY_WIDTH, MAX_DISPLAY_HEIGHT),
+                                              self._on_seek_frame)
         else:
             self.cap = None
 
@@ -130,10 +137,9 @@ class VideoHandler:
 
     def on_trackbar_drag(self, event):
         """Handle trackbar drag event"""
-        if self.is_seeking:
-            pos = int(self.app.ui_components.trackbar_var.get())
-            self.cap.set(cv2.CAP_PROP_POS_FRAMES, pos)
-            self.display_current_frame()
+        if self.is_seeking and self.seeker:
+            # Latest request wins, the seeker shows the nearest keyframe
+            self.seeker.request(int(self.app.ui_components.trackbar_var.get()))
 
     def on_trackbar_release(self, event):
         """Handle trackbar release event"""
@@ -141,8 +147,36 @@ class VideoHandler:
             return
         self.is_seeking = False
         pos = int(self.app.ui_components.trackbar_var.get())
-        if self.cap: 
+        if not self.cap:
+            return
+        if self.app.detection_manager.running:
+            # The feed thread owns the capture while detecting
+            self.pending_seek = pos
+        else:
             self.cap.set(cv2.CAP_PROP_POS_FRAMES, pos)
+            if self.seeker:
+                self.seeker.request(pos, exact=True)
+
+    def take_pending_seek(self):
+        """Frame the trackbar was released on during detection, if any"""
+        pos, self.pending_seek = self.pending_seek, None
+        return pos
+
+    def _on_seek_frame(self, pos, frame_no, img):
+        """Seeker thread callback, hands the preview to the Tk thread"""
+        self.app.root.after(0, self._show_seek_frame, pos, img)
+
+    def _show_seek_frame(self, pos, img):
+        """Show a trackbar preview unless live detection frames took over"""
+        if self.app.detection_manager.running and not self.is_seeking:
+            return
+        imgtk = ImageTk.PhotoImage(Image.fromarray(img))
+        self.app.ui_components.video_label.imgtk = imgtk
+        self.app.ui_components.video_label.configure(image=imgtk)
+        if self.video_fps:
+            self.app.ui_components.time_label.config(
+                text=f"{format_time(pos / self.video_fps)} / {format_time(self.total_frames / self.video_fps)}"
+            )
 
     def set_detection_line(self, event):
         """Set detection line position"""
@@ -158,6 +192,20 @@ class VideoHandler:
         self.app.settings['line1_x'] = event.x
         self.display_first_frame()
 
+    def add_roi_point(self, event):
+        """Add a vertex to the ROI polygon (Shift+click on the preview)"""
+        if (self.app.detection_manager.running or 
+            self.app.detection_manager.is_loading): 
+            return
+        if not hasattr(self.app.ui_components.video_label, 'imgtk'):
+            return
+
+        # Stored relative to the frame so it survives resolution changes
+        polygon = list(self.app.settings.get('roi_polygon') or [])
+        polygon.append([round(event.x / MAX_DISPLAY_WIDTH, 4), round(event.y / MAX_DISPLAY_HEIGHT, 4)])
+        self.app.settings['roi_polygon'] = polygon
+        self.display_first_frame()
+
     def display_first_frame(self):
         """Display first frame with detection lines"""
         if self.video_source is None:
@@ -186,6 +234,7 @@ class VideoHandler:
                         else "\n\nCould not read video frame.\n")
             self.app.ui_components.video_label.configure(image='', text=error_msg)
             return
+        self.frame_shape = frame.shape
 
         # Draw detection lines
         self._draw_detection_lines(frame)
@@ -196,6 +245,7 @@ class VideoHandler:
         imgtk = ImageTk.PhotoImage(Image.fromarray(img))
         self.app.ui_components.video_label.imgtk = imgtk
         self.app.ui_components.video_label.configure(image=imgtk)
+        startup_profile.mark("first frame shown")
 
     def _draw_detection_lines(self, frame):
         """Draw detection lines on frame"""
@@ -219,6 +269,21 @@ class VideoHandler:
             cv2.line(frame, (line1_pos_scaled, 0), (line1_pos_scaled, h_orig), (0, 255, 0), 2)
             cv2.line(frame, (line2_pos_scaled, 0), (line2_pos_scaled, h_orig), (0, 0, 255), 2)
 
+        polygon = self.app.settings.get('roi_polygon') or []
+        if polygon:
+            points = np.array([[px * w_orig, py * h_orig] for px, py in polygon], dtype=np.int32)
+            cv2.polylines(frame, [points], len(points) >= 3, (0, 255, 255), 2)
+
+    def get_frame_shape(self):
+        """Shape of decoded frames for the current source"""
+        if self.frame_shape is not None:
+            return self.frame_shape
+        width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)) if self.cap else 0
+        height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) if self.cap else 0
+        if width <= 0 or height <= 0:
+            width, height = 1920, 1080
+        return (height, width, 3)
+
     def display_current_frame(self):
         """Display current frame"""
         if not self.cap or not self.cap.isOpened():
@@ -232,7 +297,37 @@ class VideoHandler:
         self.app.ui_components.video_label.imgtk = imgtk
         self.app.ui_components.video_label.configure(image=imgtk)
 
+    def start_live_capture(self):
+        """Start the latest-frame grabber on the open webcam"""
+        self.stop_live_capture()
+        self.grabber = LatestFrameGrabber(self.cap, name=f"webcam-{self.video_source}-grabber").start()
+        return self.grabber
+
+    def stop_live_capture(self):
+        """Stop the grabber so the capture can be read directly again"""
+        if self.grabber is None:
+            return
+        self.grabber.stop()
+        print(f"[INFO] {self.grabber.summary()}")
+        self.grabber = None
+
+    def _release_capture(self):
+        """Close the current capture; webcams are parked for quick reuse"""
+        self.stop_live_capture()
+        if self.seeker:
+            print(f"[INFO] {self.seeker.summary()}")
+            self.seeker.close()
+            self.seeker = None
+        self.pending_seek = None
+        if self.cap:
+            if self.capture_index is not None:
+                capture_pool.park(self.capture_index, self.cap)
+            else:
+                self.cap.release()
+        self.cap = None
+        self.capture_index = None
+
     def cleanup(self):
         """Cleanup video resources"""
-        if self.cap:
-            self.cap.release()
\ No newline at end of file
+        self._release_capture()
+        capture_pool.release_all()
\ No newline at end of file
@@ -0,0 +1,133 @@
+# gui/virtual_table.py
+import tkinter.font as tkfont
+from tkinter import ttk
+
+HEADING_HEIGHT = 25
+
+
+class VirtualTable:
+    """Treeview that only ever holds the rows that fit on screen.
+
+    The scrollbar moves a window over `total` rows and the window is
+    refilled from `row_source(start, stop)`. While the view follows the
+    tail, new rows are appended and the oldest visible ones dropped, so
+    each update costs only the rows that arrived.
+    """
+
+    def __init__(self, tree, scrollbar, row_source=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_source = row_source
+        self.total = 0
+        self.top = 0
+        self.follow = True
+        self._page = 0
+        self.row_height = self._measure_row_height()
+
+        # The tree never scrolls by itself, the scrollbar drives the window
+        self.tree.configure(yscrollcommand="")
+        self.scrollbar.configure(command=self._on_scroll)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(3))
+        self.tree.bind("<Configure>", self._on_resize)
+
+    def _measure_row_height(self):
+        """Row height of the current theme, or the line height of the tree's font"""
+        style = ttk.Style(self.tree)
+        style_name = self.tree.cget("style") or "Treeview"
+        try:
+            height = int(style.lookup(style_name, "rowheight"))
+        except (TypeError, ValueError):
+            height = 0
+        if height <= 0:
+            font = style.lookup(style_name, "font") or "TkDefaultFont"
+            height = tkfont.Font(root=self.tree, font=font).metrics("linespace")
+        return max(1, height)
+
+    @property
+    def page_size(self):
+        """Rows that fit in the tree's current height"""
+        height = self.tree.winfo_height() - HEADING_HEIGHT
+        if height <= 0:
+            return int(self.tree.cget("height"))
+        return max(1, height // self.row_height)
+
+    def set_total(self, total):
+        """Tell the table how many rows exist now"""
+        page = self.page_size
+        if total < self.total or page != self._page:
+            # Rows were removed or the window changed size
+            self.total = total
+            self._clamp(page)
+            self._render()
+            return
+
+        old_total, self.total = self.total, total
+        if self.follow and total > old_total:
+            new_top = max(0, total - page)
+            if new_top - self.top >= page:
+                self.top = new_top
+                self._render()
+                return
+            for values in self._rows(old_total, total):
+                self.tree.insert("", "end", values=values)
+            children = self.tree.get_children()
+            if new_top > self.top:
+                self.tree.delete(*children[:new_top - self.top])
+            self.top = new_top
+        self._update_scrollbar()
+
+    def _rows(self, start, stop):
+        if self.row_source is None or stop <= start:
+            return []
+        return self.row_source(start, stop)
+
+    def _clamp(self, page):
+        if self.follow:
+            self.top = max(0, self.total - page)
+        self.top = max(0, min(self.top, self.total - page))
+        self.follow = self.top + page >= self.total
+
+    def _render(self):
+        page = self._page = self.page_size
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        for values in self._rows(self.top, min(self.total, self.top + page)):
+            self.tree.insert("", "end", values=values)
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        if self.total <= 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        self.scrollbar.set(self.top / self.total, min(1.0, (self.top + self._page) / self.total))
+
+    def _scroll_to(self, top):
+        page = self.page_size
+        self.top = int(top)
+        self.follow = False
+        self._clamp(page)
+        self._render()
+
+    def _scroll_by(self, rows):
+        self._scroll_to(self.top + rows)
+        return "break"
+
+    def _on_scroll(self, *args):
+        if args[0] == "moveto":
+            self._scroll_to(float(args[1]) * self.total)
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self._scroll_to(self.top + (step * self.page_size if args[2] == "pages" else step))
+
+    def _on_wheel(self, event):
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+
+    def _on_resize(self, event):
+        # Themes and fonts can change the row height after the table was built
+        self.row_height = self._measure_row_height()
+        if self.page_size != self._page:
+            self._clamp(self.page_size)
+            self._render()
\ No newline at end of file